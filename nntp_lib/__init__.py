@@ -2,24 +2,34 @@
 
 __version__ = '1.0.0'
 
-from .db import ensure_db, upsert_headers
-from .fetch import fetch_headers_chunked, get_nntp_client
+from .db import ArticleColumns, connect_db, close_db, ensure_db, ensure_schema, ensure_indexes, drop_indexes, ensure_fts, upsert_headers
+from .fetch import fetch_headers_chunked, get_nntp_client, NNTPClientPool
 from .utils import get_config, clean_text, to_iso, sanitize_filename, split_nzb, normalize_subject_for_grouping
-from .nzb import create_nzb_from_db, build_nzb_xml, group_rows_auto, create_grouped_nzbs_from_db
+from .nzb import Article, create_nzb_from_db, build_nzb_xml, group_rows_auto, create_grouped_nzbs_from_db, iter_grouped_nzbs_from_db
 
 __all__ = [
+    'ArticleColumns',
+    'connect_db',
+    'close_db',
     'ensure_db',
+    'ensure_schema',
+    'ensure_indexes',
+    'drop_indexes',
+    'ensure_fts',
     'upsert_headers',
     'fetch_headers_chunked',
     'get_nntp_client',
+    'NNTPClientPool',
     'get_config',
     'clean_text',
     'to_iso',
     'sanitize_filename',
     'split_nzb',
     'normalize_subject_for_grouping',
+    'Article',
     'create_nzb_from_db',
     'build_nzb_xml',
     'group_rows_auto',
     'create_grouped_nzbs_from_db',
+    'iter_grouped_nzbs_from_db',
 ]
@@ -0,0 +1,193 @@
+"""Header archive (NDJSON or Parquet) reading and writing."""
+
+from dataclasses import fields
+import gzip
+import io
+from itertools import islice
+from typing import BinaryIO, Iterable, Iterator
+import orjson
+from .db import ArticleColumns
+
+# Optional: only needed for Parquet archives
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+# Optional: only needed for zstd-compressed NDJSON archives
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Rows serialized per write() call: large enough to amortize the call,
+# small enough that the joined buffer stays tiny
+ARCHIVE_BATCH_ROWS = 1000
+
+# Buffer size for archive files
+ARCHIVE_BUFFER_SIZE = 1 << 20
+
+# Rows per batch when reading an archive back; bounds memory on reload
+ARCHIVE_READ_ROWS = 50_000
+
+# File name suffix per archive compression
+ARCHIVE_SUFFIXES = {
+    'none': '.json',
+    'gzip': '.json.gz',
+    'zstd': '.json.zst',
+    'parquet': '.parquet',
+}
+
+# zstd level for archives; 3 compresses overview JSON several-fold at
+# hundreds of MB/s
+ARCHIVE_ZSTD_LEVEL = 3
+
+def archive_path(base: str, group: str, compression: str = 'none') -> str:
+    """Path of a group's header archive under `base`."""
+    return f"{base}/{group}{ARCHIVE_SUFFIXES[compression]}"
+
+def _require_zstandard():
+    if zstandard is None:
+        raise RuntimeError("zstd archives need zstandard (pip install zstandard)")
+
+def _require_pyarrow():
+    if pq is None:
+        raise RuntimeError("Parquet archives need pyarrow (pip install pyarrow)")
+
+def _parquet_schema():
+    """Parquet archive columns; the same fields as the NDJSON rows."""
+    string, int64 = pa.string(), pa.int64()
+    return pa.schema([
+        ('message_id', string), ('group_name', string), ('artnum', int64),
+        ('subject', string), ('from_addr', string), ('date_epoch', int64),
+        ('refs', string), ('bytes', int64), ('lines', int64), ('xref', string),
+    ])
+
+class ParquetArchive:
+    """Header archive written as zstd-compressed Parquet, one row group per chunk.
+    
+    Each column is stored once, dictionary encoded, instead of repeating
+    every key on every NDJSON line, and reloading needs no text parsing.
+    """
+    
+    def __init__(self, path: str):
+        _require_pyarrow()
+        self.schema = _parquet_schema()
+        self._writer = pq.ParquetWriter(path, self.schema, compression='zstd')
+    
+    def write(self, columns: ArticleColumns, group: str) -> int:
+        """Append one fetched chunk as a row group. Returns the number of rows."""
+        table = pa.table({
+            'message_id': columns.message_id,
+            'group_name': [group] * len(columns),
+            'artnum': columns.artnum,
+            'subject': columns.subject,
+            'from_addr': columns.from_addr,
+            'date_epoch': columns.date_epoch,
+            'refs': columns.refs,
+            'bytes': columns.bytes,
+            'lines': columns.lines,
+            'xref': columns.xref,
+        }, schema=self.schema)
+        self._writer.write_table(table)
+        return len(columns)
+    
+    def close(self):
+        self._writer.close()
+    
+    def __enter__(self) -> 'ParquetArchive':
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+def open_archive(path: str, compression: str = 'none') -> BinaryIO | ParquetArchive:
+    """Open a header archive for writing.
+    
+    Args:
+        path: Archive file path (see archive_path)
+        compression: 'none', 'gzip', 'zstd' or 'parquet'. gzip runs at
+                     level 1; overview JSON shrinks several-fold even at the
+                     fastest level. 'zstd' compresses better and faster on
+                     all cores and needs zstandard. 'parquet' writes a
+                     columnar file instead of NDJSON and needs pyarrow.
+    """
+    if compression == 'parquet':
+        return ParquetArchive(path)
+    if compression == 'zstd':
+        _require_zstandard()
+        cctx = zstandard.ZstdCompressor(level=ARCHIVE_ZSTD_LEVEL, threads=-1)
+        return cctx.stream_writer(open(path, "wb"), closefd=True)
+    if compression == 'gzip':
+        return gzip.open(path, "wb", compresslevel=1)
+    if compression != 'none':
+        raise ValueError(f"Unknown archive compression: {compression}")
+    return open(path, "wb", buffering=ARCHIVE_BUFFER_SIZE)
+
+def write_ndjson(f: BinaryIO, rows: Iterable[dict]) -> int:
+    """Append rows to `f` as newline-delimited JSON.
+    
+    Rows are serialized in batches of ARCHIVE_BATCH_ROWS, so no buffer the
+    size of the whole input is ever built.
+    
+    Returns:
+        Number of rows written
+    """
+    write = f.write
+    dumps = orjson.dumps
+    count = 0
+    batch = []
+    add = batch.append
+    for row in rows:
+        add(dumps(row))
+        if len(batch) >= ARCHIVE_BATCH_ROWS:
+            add(b'')
+            write(b'\n'.join(batch))
+            count += len(batch) - 1
+            batch.clear()
+    if batch:
+        add(b'')
+        write(b'\n'.join(batch))
+        count += len(batch) - 1
+    return count
+
+def write_columns(archive: BinaryIO | ParquetArchive, columns: ArticleColumns, group: str) -> int:
+    """Append one fetched chunk to an archive opened with open_archive().
+    
+    Returns:
+        Number of rows written
+    """
+    if isinstance(archive, ParquetArchive):
+        return archive.write(columns, group)
+    return write_ndjson(archive, columns.to_dicts(group))
+
+def read_archive(path: str, compression: str = 'none',
+                 batch_rows: int = ARCHIVE_READ_ROWS) -> Iterator[list[dict] | ArticleColumns]:
+    """Read a header archive back in batches of at most `batch_rows` rows.
+    
+    NDJSON is parsed line by line into row dicts. Parquet is read a row group
+    slice at a time straight into ArticleColumns, skipping the per-row dicts.
+    Either batch type can be passed to upsert_headers as-is.
+    """
+    if compression == 'parquet':
+        _require_pyarrow()
+        names = [f.name for f in fields(ArticleColumns)]
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_rows, columns=names):
+            yield ArticleColumns(*(col.to_pylist() for col in batch.columns))
+        return
+    if compression == 'gzip':
+        f = gzip.open(path, "rb")
+    elif compression == 'zstd':
+        _require_zstandard()
+        reader = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+        # The decompression reader has no readline(); buffering adds it
+        f = io.BufferedReader(reader, buffer_size=ARCHIVE_BUFFER_SIZE)
+    elif compression == 'none':
+        f = open(path, "rb", buffering=ARCHIVE_BUFFER_SIZE)
+    else:
+        raise ValueError(f"Unknown archive compression: {compression}")
+    loads = orjson.loads
+    with f:
+        while batch := [loads(line) for line in islice(f, batch_rows)]:
+            yield batch
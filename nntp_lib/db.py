@@ -2,16 +2,153 @@
 
 import sqlite3
 import time
+from dataclasses import dataclass, field
+from itertools import repeat
+from typing import Iterator
 
-def ensure_db(conn: sqlite3.Connection):
-    """Create tables and indexes if they don't exist."""
-    cur = conn.cursor()
+# Secondary indexes on articles; maintained on every insert, so bulk loads
+# create them after the data is in (see ensure_indexes / drop_indexes)
+ARTICLE_INDEXES = {
+    'idx_articles_subject': 'articles(subject)',
+    'idx_articles_from': 'articles(from_addr)',
+    'idx_articles_group_artnum': 'articles(group_name, artnum)',
+    # Backs the (poster, subject) ordering of the grouped NZB query
+    'idx_articles_group_from_subject': 'articles(group_name, from_addr, subject)',
+}
+
+# Page size for newly created databases. Larger pages mean fewer page
+# reads for the big sequential scans and index builds of a header store
+PAGE_SIZE = 32768
+
+# date_epoch falls back to parsing date_utc for legacy rows that only carry
+# the ISO string (e.g. reloaded from an old JSON archive)
+_INSERT_ARTICLE = """
+    INSERT {or_ignore}INTO articles (
+        message_id, group_name, artnum, subject, from_addr, date_utc, date_epoch, refs, bytes, lines, xref
+    ) VALUES (
+        ?1, ?2, ?3, ?4, ?5, ?6, COALESCE(?7, CAST(strftime('%s', ?6) AS INTEGER)), ?8, ?9, ?10, ?11
+    )
+    {on_conflict}"""
+
+# Native UPSERT (SQLite 3.24+) only resolves the message_id conflict instead of
+# the blanket OR IGNORE conflict handling
+if sqlite3.sqlite_version_info >= (3, 24, 0):
+    UPSERT_ARTICLE_SQL = _INSERT_ARTICLE.format(or_ignore='', on_conflict='ON CONFLICT(message_id) DO NOTHING')
+else:
+    UPSERT_ARTICLE_SQL = _INSERT_ARTICLE.format(or_ignore='OR IGNORE ', on_conflict='')
+
+@dataclass(slots=True)
+class ArticleColumns:
+    """Overview rows for one group stored column-wise, one list per column.
     
-    # Set performance PRAGMAs
-    cur.execute("PRAGMA synchronous = OFF")
-    cur.execute("PRAGMA journal_mode = WAL")
-    cur.execute("PRAGMA temp_store = MEMORY")
-    cur.execute("PRAGMA cache_size = -64000")  # 64MB cache
+    Avoids a dict per article (several hundred bytes each) between the fetch
+    and the database bind; group_name is supplied when binding.
+    """
+    message_id: list[str] = field(default_factory=list)
+    artnum: list[int] = field(default_factory=list)
+    subject: list[str] = field(default_factory=list)
+    from_addr: list[str] = field(default_factory=list)
+    date_epoch: list[int | None] = field(default_factory=list)
+    refs: list[str | None] = field(default_factory=list)
+    bytes: list[int] = field(default_factory=list)
+    lines: list[int] = field(default_factory=list)
+    xref: list[str | None] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.artnum)
+
+    def extend(self, other: 'ArticleColumns'):
+        """Append all rows of `other`."""
+        self.message_id.extend(other.message_id)
+        self.artnum.extend(other.artnum)
+        self.subject.extend(other.subject)
+        self.from_addr.extend(other.from_addr)
+        self.date_epoch.extend(other.date_epoch)
+        self.refs.extend(other.refs)
+        self.bytes.extend(other.bytes)
+        self.lines.extend(other.lines)
+        self.xref.extend(other.xref)
+
+    def params(self, group: str) -> Iterator[tuple]:
+        """Positional parameters in UPSERT_ARTICLE_SQL column order."""
+        return zip(self.message_id, repeat(group), self.artnum, self.subject, self.from_addr,
+                   repeat(None), self.date_epoch, self.refs, self.bytes, self.lines, self.xref)
+
+    def to_dicts(self, group: str) -> Iterator[dict]:
+        """Yield one row dict per article, e.g. for the JSON archive."""
+        for (message_id, group_name, artnum, subject, from_addr,
+             _, date_epoch, refs, nbytes, nlines, xref) in self.params(group):
+            yield {
+                "message_id": message_id,
+                "group_name": group_name,
+                "artnum": artnum,
+                "subject": subject,
+                "from_addr": from_addr,
+                "date_epoch": date_epoch,
+                "refs": refs,
+                "bytes": nbytes,
+                "lines": nlines,
+                "xref": xref,
+            }
+
+def connect_db(path: str, read_only: bool = False, page_size: int = PAGE_SIZE) -> sqlite3.Connection:
+    """Open a database and apply the connection PRAGMAs exactly once.
+    
+    WAL with synchronous=NORMAL is durable across application crashes and
+    as fast as synchronous=OFF for bulk writes. With read_only, statements
+    that would write are rejected (PRAGMA query_only). Use close_db() to close.
+    
+    page_size only applies when the database is created; an existing one
+    keeps its own.
+    """
+    conn = sqlite3.connect(path)
+    conn.executescript(f"""
+        PRAGMA page_size = {int(page_size)};
+        PRAGMA journal_mode = WAL;
+        PRAGMA synchronous = NORMAL;
+        PRAGMA temp_store = MEMORY;
+        PRAGMA cache_size = -262144;
+        PRAGMA mmap_size = 30000000000;
+        PRAGMA wal_autocheckpoint = 10000;
+    """)
+    if read_only:
+        conn.execute("PRAGMA query_only = 1")
+    return conn
+
+def close_db(conn: sqlite3.Connection):
+    """Refresh planner statistics where needed, then close the connection.
+    
+    Read-only connections are closed as they are: the refresh writes, and
+    could fail with "database is locked" while create_db.py is loading.
+    """
+    if not conn.execute("PRAGMA query_only").fetchone()[0]:
+        conn.execute("PRAGMA analysis_limit = 1000")
+        conn.execute("PRAGMA optimize")
+    conn.close()
+
+def backup_db(conn: sqlite3.Connection, path: str):
+    """Copy `conn` (e.g. an in-memory bulk load) over the database at `path`.
+    
+    The destination is replaced wholesale, so the copy runs with no journal
+    and no fsyncs; it is switched to WAL and synced once at the end. The
+    copy is done in a single backup step.
+    """
+    conn_disk = sqlite3.connect(path)
+    conn_disk.executescript("""
+        PRAGMA journal_mode = OFF;
+        PRAGMA synchronous = OFF;
+        PRAGMA cache_size = -262144;
+    """)
+    conn.backup(conn_disk)
+    conn_disk.executescript("""
+        PRAGMA journal_mode = WAL;
+        PRAGMA synchronous = NORMAL;
+    """)
+    close_db(conn_disk)
+
+def ensure_schema(conn: sqlite3.Connection):
+    """Create the articles table if it doesn't exist, without secondary indexes."""
+    cur = conn.cursor()
     
     # Base table
     cur.execute("""
@@ -22,6 +159,7 @@ def ensure_db(conn: sqlite3.Connection):
         subject      TEXT,
         from_addr    TEXT,
         date_utc     TEXT,
+        date_epoch   INTEGER,
         refs         TEXT,
         bytes        INTEGER,
         lines        INTEGER,
@@ -29,35 +167,112 @@ def ensure_db(conn: sqlite3.Connection):
     );
     """)
     
-    # Indexes for text searches and common queries
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_articles_subject ON articles(subject);")
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_articles_from ON articles(from_addr);")
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_articles_group_artnum ON articles(group_name, artnum);")
+    # Migration: date_epoch (UTC seconds) replaces the ISO date_utc string,
+    # which is only kept for rows stored before the column existed
+    columns = {row[1] for row in cur.execute("PRAGMA table_info(articles)")}
+    if 'date_epoch' not in columns:
+        cur.execute("ALTER TABLE articles ADD COLUMN date_epoch INTEGER")
+        cur.execute("""
+            UPDATE articles SET date_epoch = CAST(strftime('%s', date_utc) AS INTEGER)
+            WHERE date_utc IS NOT NULL
+        """)
+
+    conn.commit()
+
+def ensure_indexes(conn: sqlite3.Connection):
+    """Create indexes for text searches and common queries if they don't exist."""
+    cur = conn.cursor()
+    for name, target in ARTICLE_INDEXES.items():
+        cur.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target};")
+    conn.commit()
+
+def drop_indexes(conn: sqlite3.Connection):
+    """Drop the secondary indexes before a large bulk load."""
+    cur = conn.cursor()
+    for name in ARTICLE_INDEXES:
+        cur.execute(f"DROP INDEX IF EXISTS {name};")
+    conn.commit()
 
+def ensure_db(conn: sqlite3.Connection):
+    """Create tables and indexes if they don't exist."""
+    ensure_schema(conn)
+    ensure_indexes(conn)
+
+def ensure_fts(conn: sqlite3.Connection) -> bool:
+    """Create the articles_fts substring index if missing and add any new articles to it.
+    
+    articles_fts is a contentless FTS5 table with the trigram tokenizer over
+    subject and from_addr, keyed by the articles rowid. Articles are only
+    ever appended, so syncing indexes the rows past the highest rowid already
+    in it.
+    
+    Returns:
+        False if this SQLite build has no trigram tokenizer (before 3.34)
+    """
+    if sqlite3.sqlite_version_info < (3, 34, 0):
+        return False
+    cur = conn.cursor()
+    cur.execute("""
+    CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+        subject, from_addr, content='', tokenize='trigram'
+    );
+    """)
+    cur.execute("""
+        INSERT INTO articles_fts (rowid, subject, from_addr)
+        SELECT rowid, subject, from_addr FROM articles
+        WHERE rowid > COALESCE((SELECT rowid FROM articles_fts ORDER BY rowid DESC LIMIT 1), 0)
+    """)
     conn.commit()
+    return True
 
-def upsert_headers(conn: sqlite3.Connection, group: str, rows: list[dict]):
-    """Insert or ignore headers into database."""
-    to_bind = []
-    for r in rows:
-        b = r.copy()
-        b["group_name"] = group
-        to_bind.append(b)
+def fts_ready(conn: sqlite3.Connection) -> bool:
+    """Whether articles_fts exists and covers every article."""
+    cur = conn.cursor()
+    if not cur.execute("SELECT 1 FROM sqlite_master WHERE name = 'articles_fts'").fetchone():
+        return False
+    indexed = cur.execute("SELECT rowid FROM articles_fts ORDER BY rowid DESC LIMIT 1").fetchone()
+    stored = cur.execute("SELECT MAX(rowid) FROM articles").fetchone()
+    return (indexed[0] if indexed else None) == stored[0]
 
+def set_bulk_load_pragmas(conn: sqlite3.Connection):
+    """Trade durability for speed for the duration of a one-off bulk load.
+    
+    The in-memory journal and exclusive lock last until the connection closes,
+    so only use this on a database that can be rebuilt, e.g. an in-memory one
+    that is backed up to disk afterwards.
+    """
+    cur = conn.cursor()
+    cur.execute("PRAGMA synchronous = OFF")
+    cur.execute("PRAGMA journal_mode = MEMORY")
+    cur.execute("PRAGMA locking_mode = EXCLUSIVE")
+    cur.execute("PRAGMA mmap_size = 30000000000")
+
+def upsert_headers(conn: sqlite3.Connection, group: str, rows: ArticleColumns | list[dict],
+                   commit: bool = True):
+    """Insert headers into database, skipping message IDs already stored.
+    
+    `rows` is either an ArticleColumns batch or a list of row dicts (e.g.
+    loaded from the JSON archive). Pass commit=False to keep the insert
+    inside the caller's open transaction, e.g. when streaming many chunks
+    into one transaction.
+    """
     cur = conn.cursor()
     start_time = time.time()
     
-    cur.executemany(
-        """
-        INSERT OR IGNORE INTO articles (
-            message_id, group_name, artnum, subject, from_addr, date_utc, refs, bytes, lines, xref
-        ) VALUES (
-            :message_id, :group_name, :artnum, :subject, :from_addr, :date_utc, :refs, :bytes, :lines, :xref
+    # group_name is constant for the call, so bind it positionally instead
+    # of copying every row dict to inject it
+    if isinstance(rows, ArticleColumns):
+        params = rows.params(group)
+    else:
+        params = (
+            (r["message_id"], group, r["artnum"], r.get("subject", ""), r.get("from_addr", ""),
+             r.get("date_utc"), r.get("date_epoch"), r.get("refs"), r.get("bytes", 0), r.get("lines", 0),
+             r.get("xref"))
+            for r in rows
         )
-        """,
-        to_bind,
-    )
+    cur.executemany(UPSERT_ARTICLE_SQL, params)
     
-    conn.commit()
+    if commit:
+        conn.commit()
     end_time = time.time()
     print(f"Wrote to db {len(rows):,} for {group}, Elapsed = {end_time - start_time:.4f} seconds")
@@ -1,12 +1,186 @@
 """NNTP fetching operations."""
 
 import nntplib
+import threading
 import time
+import zlib
 from configparser import ConfigParser
+from datetime import date
+from email.utils import mktime_tz, parsedate_tz
+from functools import lru_cache
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from .utils import clean_text, to_iso
+from contextlib import contextmanager
+from typing import Callable
+from .db import ArticleColumns
 
-def get_nntp_client(config: ConfigParser) -> nntplib.NNTP_SSL:
+class NNTPClient(nntplib.NNTP_SSL):
+    """NNTP_SSL connection that can receive gzip-compressed XOVER responses."""
+
+    compressed = False
+    # Position of Xref among the optional fields after the 8 fixed XOVER fields;
+    # None if the server's overview format does not include it
+    xref_index = 0
+    # Socket read buffer size; larger than io's default so each read can
+    # take a whole TLS record
+    read_size = 1 << 16
+
+    def _base_init(self, readermode):
+        # Runs right after nntplib opens the socket file, before anything is read
+        self.file.close()
+        self.file = self.sock.makefile("rwb", buffering=self.read_size)
+        super()._base_init(readermode)
+
+    def load_overview_format(self):
+        """Query LIST OVERVIEW.FMT once for this connection and cache the Xref position."""
+        try:
+            fmt = self._getoverviewfmt()
+        except nntplib.NNTPError:
+            return
+        optional = fmt[len(nntplib._DEFAULT_OVERVIEW_FMT):]
+        if optional:
+            self.xref_index = optional.index('xref') if 'xref' in optional else None
+
+    def enable_compression(self) -> bool:
+        """Ask the server to compress overview data (XFEATURE COMPRESS GZIP).
+        
+        Returns:
+            True if the server accepted, False if it does not support it
+        """
+        try:
+            resp = self._shortcmd("XFEATURE COMPRESS GZIP")
+        except nntplib.NNTPError:
+            return False
+        self.compressed = resp.startswith('290')
+        return self.compressed
+
+    def _getcompressedresp(self) -> list[bytes]:
+        """Read a gzip/zlib compressed multi-line block and return its lines."""
+        inflate = zlib.decompressobj(zlib.MAX_WBITS | 32)
+        parts = []
+        while not inflate.eof:
+            # Peek and consume only what the inflater used, so bytes of a
+            # pipelined follow-up response stay in the read buffer
+            data = self.file.peek(self.read_size)
+            if not data:
+                raise EOFError
+            parts.append(inflate.decompress(data))
+            self.file.read(len(data) - len(inflate.unused_data))
+        
+        # Servers put the ".\r\n" terminator inside the compressed stream,
+        # or (with the TERMINATOR option) send it uncompressed after it
+        data = b''.join(parts)
+        if data == b'.\r\n' or data.endswith(b'\r\n.\r\n'):
+            data = data[:-3]
+        elif self._getline() != b'.':
+            raise nntplib.NNTPDataError('missing terminator after compressed block')
+        
+        lines = data.split(b'\r\n')
+        if lines[-1] == b'':
+            lines.pop()
+        return lines
+
+    def _getlongresp(self, file=None):
+        """nntplib's multi-line reader, inflating compressed blocks.
+        
+        Covers the commands nntplib reads itself (OVER, XHDR, ...) once
+        compression has been negotiated for the connection.
+        """
+        if file is not None or not self.compressed:
+            return super()._getlongresp(file)
+        
+        resp = self._getresp()
+        if resp[:3] not in nntplib._LONGRESP:
+            raise nntplib.NNTPReplyError(resp)
+        if 'COMPRESS=GZIP' in resp.upper():
+            lines = self._getcompressedresp()
+        else:
+            lines = []
+            while (line := self._getline()) != b'.':
+                lines.append(line)
+        return resp, [line[1:] if line[:2] == b'..' else line for line in lines]
+
+    def _getblocklines(self) -> list[bytes]:
+        """Read a plain multi-line block in buffer-sized reads and split it once.
+        
+        Avoids a readline() call per overview line. Only the bytes up to
+        and including the terminator are consumed, so a pipelined
+        follow-up response stays in the read buffer.
+        """
+        # Seeded with CRLF so an empty block (just ".\r\n") ends at offset 0
+        buf = bytearray(b'\r\n')
+        scan_from = 0
+        while True:
+            data = self.file.peek(self.read_size)
+            if not data:
+                raise EOFError
+            buf += data
+            end = buf.find(b'\r\n.\r\n', scan_from)
+            if end >= 0:
+                self.file.read(len(data) - (len(buf) - end - 5))
+                break
+            self.file.read(len(data))
+            scan_from = max(0, len(buf) - 4)
+        
+        if end == 0:
+            return []
+        return bytes(memoryview(buf)[2:end]).split(b'\r\n')
+
+    def _getxoverresp(self) -> tuple[str, list[bytes]]:
+        """Read one XOVER response and its undecoded overview lines."""
+        try:
+            resp = self._getresp()
+        except nntplib.NNTPTemporaryError as e:
+            # 423: no articles in that range, i.e. an empty (sparse) chunk
+            if e.response[:3] == '423':
+                return e.response, []
+            raise
+        if resp[:3] != '224':
+            raise nntplib.NNTPReplyError(resp)
+        
+        if self.compressed and 'COMPRESS=GZIP' in resp.upper():
+            return resp, self._getcompressedresp()
+        return resp, self._getblocklines()
+
+    def xover_raw(self, start: int, end: int) -> tuple[str, list[bytes]]:
+        """Send XOVER and return the undecoded overview lines.
+        
+        Skips nntplib's per-line decode and field dict construction.
+        Overview lines begin with an article number, so dot-unstuffing
+        is never needed.
+        """
+        self._putcmd(f'XOVER {start}-{end}')
+        return self._getxoverresp()
+
+    def xover_raw_many(self, ranges: list[tuple[int, int]]) -> list[tuple[str, list[bytes]] | nntplib.NNTPError]:
+        """Pipeline several XOVER commands and read their responses in order.
+        
+        All commands are written in one flush so the server can stream the
+        next block while earlier ones are parsed. An error reply is returned
+        in place of that range's response and the rest are still read,
+        leaving the connection in sync; socket errors are raised.
+        """
+        for start, end in ranges:
+            self.file.write(f'XOVER {start}-{end}\r\n'.encode(self.encoding))
+        self.file.flush()
+        
+        results = []
+        for _ in ranges:
+            try:
+                results.append(self._getxoverresp())
+            except nntplib.NNTPError as e:
+                results.append(e)
+        return results
+
+    def xover(self, start, end, *, file=None):
+        """XOVER that transparently inflates compressed responses."""
+        if file is not None:
+            return super().xover(start, end, file=file)
+        
+        resp, lines = self.xover_raw(start, end)
+        lines = [line.decode(self.encoding, self.errors) for line in lines]
+        return resp, nntplib._parse_overview(lines, self._getoverviewfmt())
+
+def get_nntp_client(config: ConfigParser) -> NNTPClient:
     """Create an NNTP SSL connection from config."""
     host = config['servers']['host']
     port = config.getint('servers', 'port')
@@ -14,81 +188,254 @@ def get_nntp_client(config: ConfigParser) -> nntplib.NNTP_SSL:
     password = config['servers']['password']
     timeout = config.getint('servers', 'timeout', fallback=60)
     
-    client = nntplib.NNTP_SSL(
+    client = NNTPClient(
         host=host,
         port=port,
         user=username,
         password=password,
         timeout=timeout
     )
+    if config.getboolean('servers', 'compression', fallback=True):
+        client.enable_compression()
+    client.load_overview_format()
     return client
 
-def row_from_overview(group: str, artnum: int, ov: dict, key_map: dict) -> dict:
-    """Convert NNTP overview dict to our row format using pre-built key mapping."""
+class NNTPClientPool:
+    """Bounded pool of authenticated NNTP connections shared by fetch workers.
     
-    def get_field(field_name):
-        key = key_map.get(field_name)
-        if key and key in ov:
-            value = ov[key]
-            if isinstance(value, str):
-                return clean_text(value)
-            return value
-        return None
+    Connections are opened lazily, up to `size`, and reused across chunks so
+    a fetch costs O(size) TLS/AUTHINFO handshakes instead of one per chunk.
+    """
+
+    def __init__(self, config: ConfigParser, size: int):
+        self.config = config
+        self.size = size
+        self._idle = []
+        self._open = 0
+        # Signalled whenever a connection goes idle or a slot frees up
+        self._cond = threading.Condition()
+
+    def _acquire(self, fresh: bool = False, wait: bool = True) -> NNTPClient | None:
+        stale = None
+        with self._cond:
+            while not self._idle and self._open >= self.size:
+                if not wait:
+                    return None
+                self._cond.wait()
+            if self._idle and not (fresh and self._open < self.size):
+                client = self._idle.pop()
+                if not fresh:
+                    return client
+                # At the cap: replace an idle connection rather than reuse it
+                stale = client
+            else:
+                self._open += 1
+        
+        if stale is not None:
+            self._quit(stale)
+        try:
+            return get_nntp_client(self.config)
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+
+    @staticmethod
+    def _quit(client: NNTPClient):
+        try:
+            client.quit()
+        except Exception:
+            pass
+
+    def _discard(self, client: NNTPClient):
+        with self._cond:
+            self._open -= 1
+            self._cond.notify()
+        self._quit(client)
+
+    @contextmanager
+    def client(self, fresh: bool = False, wait: bool = True):
+        """Borrow a connection; it is closed and replaced if the caller raises.
+        
+        Args:
+            fresh: open a new connection instead of reusing an idle one,
+                   e.g. to retry after an idle connection was dropped
+            wait: block until a connection is free; if False, yield None
+                  instead when the pool is exhausted
+        """
+        client = self._acquire(fresh, wait)
+        if client is None:
+            yield None
+            return
+        try:
+            yield client
+        except BaseException:
+            self._discard(client)
+            raise
+        with self._cond:
+            self._idle.append(client)
+            self._cond.notify()
+
+    def close(self):
+        """Quit all idle connections."""
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for client in idle:
+            self._discard(client)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+_MONTHS = {
+    b'jan': 1, b'feb': 2, b'mar': 3, b'apr': 4, b'may': 5, b'jun': 6,
+    b'jul': 7, b'aug': 8, b'sep': 9, b'oct': 10, b'nov': 11, b'dec': 12,
+}
+_ZONES = {b'gmt': 0, b'ut': 0, b'utc': 0, b'z': 0}
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+@lru_cache(maxsize=65536)
+def _day_epoch(day: bytes, month: bytes, year: bytes, zone: bytes) -> int:
+    """Epoch seconds of midnight on the given day in the given zone.
     
-    return {
-        "message_id": get_field('message-id'),
-        "group_name": group,
-        "artnum": int(artnum),
-        "subject": get_field('subject') or "",
-        "from_addr": get_field('from') or "",
-        "date_utc": to_iso(get_field('date')),
-        "refs": get_field('references'),
-        "bytes": int(get_field('bytes') or 0),
-        "lines": int(get_field('lines') or 0),
-        "xref": get_field('xref'),
-    }
-
-def fetch_rows_xover(nntp_client, group: str, start: int, end: int) -> list[dict]:
-    """Fetch headers for a single range using XOVER."""
-    rows = []
-    start_time = time.time()
-    nntp_client.group(group)
+    Consecutive articles share the date and zone, so this is mostly cached.
+    Raises ValueError/KeyError for forms the fast path does not handle.
+    """
+    if len(year) != 4:
+        raise ValueError(year)
+    if zone[:1] in b'+-' and len(zone) == 5:
+        offset = (int(zone[1:3]) * 3600 + int(zone[3:5]) * 60) * (-1 if zone[:1] == b'-' else 1)
+    else:
+        offset = _ZONES[zone.lower()]
+    days = date(int(year), _MONTHS[month[:3].lower()], int(day)).toordinal() - _EPOCH_ORDINAL
+    return days * 86400 - offset
+
+def parse_overview_date(value: bytes) -> int | None:
+    """Convert an overview Date field to UTC epoch seconds.
     
-    resp, overviews = nntp_client.xover(int(start), int(end))
+    Handles the common "[Day, ]DD Mon YYYY HH:MM[:SS] +HHMM" form with a
+    month table and integer arithmetic instead of email.utils; anything
+    else falls back to email.utils.parsedate_tz.
+    """
+    parts = value.split()
+    if parts and parts[0][-1:] == b',':
+        del parts[0]
+    try:
+        day, month, year, clock, zone = parts[:5]
+        hms = clock.split(b':')
+        return (_day_epoch(day, month, year, zone)
+                + int(hms[0]) * 3600 + int(hms[1]) * 60 + (int(hms[2]) if len(hms) > 2 else 0))
+    except (ValueError, KeyError, IndexError):
+        pass
     
-    if not overviews:
-        return rows
+    parsed = parsedate_tz(value.decode('utf-8', 'ignore'))
+    if parsed is None:
+        return None
+    try:
+        return mktime_tz(parsed)
+    except (ValueError, OverflowError):
+        return None
+
+def parse_overview_lines(lines: list[bytes], xref_index: int | None = 0) -> tuple[ArticleColumns, int]:
+    """Parse raw XOVER lines into a column batch.
     
-    # Build key mapping once from first overview
-    first_artnum, first_ov = overviews[0]
-    key_map = {}
-    field_names = ['message-id', 'subject', 'from', 'date', 'references', 'bytes', 'lines', 'xref']
+    RFC 3977 fixes the field order: artnum, subject, from, date, message-id,
+    references, bytes, lines, then optional fields; `xref_index` is the
+    position of Xref among those (see NNTPClient.load_overview_format).
+    Column appends are bound to locals to keep the per-line work to the
+    split and decodes.
     
-    for field_name in field_names:
-        field_lower = field_name.lower()
-        for key in first_ov.keys():
-            key_lower = key.lower()
-            if field_lower in key_lower:
-                key_map[field_name] = key
-                break
+    Returns:
+        (columns, total payload bytes)
+    """
+    columns = ArticleColumns()
+    add_message_id = columns.message_id.append
+    add_artnum = columns.artnum.append
+    add_subject = columns.subject.append
+    add_from = columns.from_addr.append
+    add_date = columns.date_epoch.append
+    add_refs = columns.refs.append
+    add_bytes = columns.bytes.append
+    add_lines = columns.lines.append
+    add_xref = columns.xref.append
     
-    # Process all overviews using the key map
-    for artnum, ov in overviews:
-        if artnum is None or not isinstance(ov, dict):
+    payload_bytes = 0
+    for line in lines:
+        payload_bytes += len(line)
+        fields = line.split(b'\t', 8)
+        if len(fields) < 8:
             continue
-        rows.append(row_from_overview(group, int(artnum), ov, key_map))
+        artnum, subject, from_addr, date_field, message_id, refs, nbytes, nlines, *extra = fields
+        
+        xref = None
+        if extra and xref_index is not None:
+            optional = extra[0].split(b'\t', xref_index + 1)
+            xref = optional[xref_index] if xref_index < len(optional) else b''
+            if xref[:6].lower() == b'xref: ':
+                xref = xref[6:]
+            xref = xref.decode('utf-8', 'ignore') if xref else None
+        
+        add_message_id(message_id.decode('utf-8', 'ignore'))
+        add_artnum(int(artnum))
+        add_subject(subject.decode('utf-8', 'ignore'))
+        add_from(from_addr.decode('utf-8', 'ignore'))
+        add_date(parse_overview_date(date_field) if date_field else None)
+        add_refs(refs.decode('utf-8', 'ignore'))
+        add_bytes(int(nbytes or 0))
+        add_lines(int(nlines or 0))
+        add_xref(xref)
     
-    end_time = time.time()
-    payload_MB = sum(len(str(r).encode("utf-8")) for r in rows) / 1_000_000.0
-    mbps = payload_MB / (end_time - start_time) if (end_time - start_time) > 0 else 0
-    print(f"Retrieved {len(rows):,} from {group} ({start:,}-{end:,}), "
-          f"Elapsed = {end_time - start_time:.4f}s at {mbps:.2f} MB/s")
+    return columns, payload_bytes
 
+def fetch_rows_xover(nntp_client: NNTPClient, group: str, start: int, end: int) -> ArticleColumns:
+    """Fetch headers for a single range using XOVER."""
+    rows = fetch_rows_xover_many(nntp_client, group, [(start, end)])[0]
+    if isinstance(rows, Exception):
+        raise rows
     return rows
 
+def fetch_rows_xover_many(nntp_client: NNTPClient, group: str,
+                          ranges: list[tuple[int, int]]) -> list[ArticleColumns | nntplib.NNTPError]:
+    """Fetch headers for several ranges with pipelined XOVER commands.
+    
+    Returns:
+        One column batch per range, in the order of `ranges`, or the error
+        the server replied with for that range
+    """
+    start_time = time.time()
+    nntp_client.group(group)
+    
+    responses = nntp_client.xover_raw_many([(int(start), int(end)) for start, end in ranges])
+    
+    results = []
+    for (start, end), response in zip(ranges, responses):
+        if isinstance(response, Exception):
+            results.append(response)
+            continue
+        resp, lines = response
+        rows, payload_bytes = parse_overview_lines(lines, nntp_client.xref_index)
+        results.append(rows)
+        
+        if not rows:
+            continue
+        
+        end_time = time.time()
+        payload_MB = payload_bytes / 1_000_000.0
+        mbps = payload_MB / (end_time - start_time) if (end_time - start_time) > 0 else 0
+        print(f"Retrieved {len(rows):,} from {group} ({start:,}-{end:,}), "
+              f"Elapsed = {end_time - start_time:.4f}s at {mbps:.2f} MB/s")
+
+    return results
+
 def fetch_headers_chunked(config: ConfigParser, group: str, 
                           start: int, back_filled_up_to: int,
-                          limit: int = 0, chunk_size: int = 100_000) -> list[dict]:
+                          limit: int = 0, chunk_size: int = 100_000,
+                          sink: Callable[[ArticleColumns], None] | None = None,
+                          pool: NNTPClientPool | None = None,
+                          max_workers: int | None = None) -> ArticleColumns | int:
     """
     Fetch headers in chunks using multithreading.
     
@@ -99,14 +446,38 @@ def fetch_headers_chunked(config: ConfigParser, group: str,
         back_filled_up_to: local_min (lower bound)
         limit: number of headers to fetch (<=0 means "all available")
         chunk_size: max articles per XOVER range
+        sink: optional callable receiving each chunk's rows as it completes.
+              It is always called from the calling thread, so it can write
+              to a sqlite3 connection owned by the caller. Rows are not
+              accumulated or sorted when a sink is given.
+        pool: optional connection pool to borrow clients from; by default a
+              pool of `max_workers` connections is opened and closed here.
+        max_workers: number of fetch threads; defaults to [servers] max_workers
     
     Returns:
-        List[dict]: parsed overview rows sorted by article number
+        ArticleColumns: parsed overview rows sorted by article number, or
+        the number of rows passed to `sink` if one was given
     """
-    # Get group info with temporary connection
-    temp_client = get_nntp_client(config)
-    nntp_max, nntp_min = temp_client.group(group)[1:3]
-    temp_client.quit()
+    if max_workers is None:
+        max_workers = config.getint('servers', 'max_workers', fallback=5)
+    pipeline_depth = config.getint('servers', 'pipeline_depth', fallback=4)
+    own_pool = pool is None
+    if own_pool:
+        pool = NNTPClientPool(config, max_workers)
+    try:
+        return _fetch_headers_pooled(pool, group, start, back_filled_up_to, limit, chunk_size,
+                                     sink, max_workers, pipeline_depth)
+    finally:
+        if own_pool:
+            pool.close()
+
+def _fetch_headers_pooled(pool: NNTPClientPool, group: str, start: int, back_filled_up_to: int,
+                          limit: int, chunk_size: int, sink: Callable[[ArticleColumns], None] | None,
+                          max_workers: int, pipeline_depth: int) -> ArticleColumns | int:
+    """Body of fetch_headers_chunked, run against an open connection pool."""
+    # Get group info
+    with pool.client() as client:
+        _, _, nntp_min, nntp_max, _ = client.group(group)
 
     # Use passed-in parameters as the range
     local_min = back_filled_up_to or nntp_min
@@ -135,37 +506,80 @@ def fetch_headers_chunked(config: ConfigParser, group: str,
         chunks.append((chunk_start, chunk_end))
         current = chunk_end + 1
     
-    max_workers = config.getint('servers', 'max_workers', fallback=5)
-    print(f"Fetching {len(chunks)} chunks in parallel with {max_workers} workers...")
+    # Consecutive chunks are pipelined on one connection, but never so deep
+    # that fewer batches than workers remain
+    depth = max(1, min(pipeline_depth, -(-len(chunks) // max_workers)))
+    batches = [chunks[i:i + depth] for i in range(0, len(chunks), depth)]
+    print(f"Fetching {len(chunks)} chunks in parallel with {max_workers} workers "
+          f"({depth} pipelined per request)...")
     
-    def fetch_chunk_with_client(chunk_start, chunk_end):
-        """Worker function that creates its own NNTP client."""
-        client = get_nntp_client(config)
+    def fetch_ranges(ranges, fresh=False):
+        """Fetch `ranges` on one pooled client; a lost connection fails them all."""
         try:
-            return fetch_rows_xover(client, group=group, start=chunk_start, end=chunk_end)
-        finally:
-            client.quit()
+            with pool.client(fresh) as client:
+                return fetch_rows_xover_many(client, group=group, ranges=ranges)
+        except (nntplib.NNTPError, OSError, EOFError) as e:
+            return [e] * len(ranges)
     
-    # Fetch chunks in parallel
-    all_rows = []
+    def fetch_batch_with_client(batch):
+        """Worker function that borrows a pooled NNTP client.
+        
+        Ranges that failed are retried once on a new connection: idle pooled
+        connections can be dropped by the server during long upserts, and
+        an incremental run would never go back for the missed articles.
+        
+        Returns:
+            Column batch or error per chunk, in the order of `batch`
+        """
+        results = fetch_ranges(batch)
+        failed = [i for i, rows in enumerate(results) if isinstance(rows, Exception)]
+        if failed:
+            print(f"Retrying {len(failed)} of {len(batch)} chunks from "
+                  f"{batch[0][0]:,}-{batch[-1][1]:,} on a new connection: {results[failed[0]]}")
+            retried = fetch_ranges([batch[i] for i in failed], fresh=True)
+            for i, rows in zip(failed, retried):
+                results[i] = rows
+        return results
+    
+    # Fetch chunks in parallel. Threads are enough here: workers block in
+    # SSL reads with the GIL released, their number is capped by the server's
+    # connection limit, and pipelining already keeps each connection busy.
+    results = {}
+    total_rows = 0
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all chunks
-        future_to_chunk = {
-            executor.submit(fetch_chunk_with_client, chunk_start, chunk_end): (chunk_start, chunk_end)
-            for chunk_start, chunk_end in chunks
+        # Submit all batches
+        future_to_batch = {
+            executor.submit(fetch_batch_with_client, batch): batch
+            for batch in batches
         }
         
         # Collect results as they complete
-        for future in as_completed(future_to_chunk):
-            chunk_start, chunk_end = future_to_chunk[future]
+        for future in as_completed(future_to_batch):
+            batch = future_to_batch[future]
             try:
-                chunk_rows = future.result()
-                all_rows.extend(chunk_rows)
-                print(f"Completed {chunk_start:,}-{chunk_end:,}: Total so far {len(all_rows):,}/{want:,}")
+                batch_rows = future.result()
             except Exception as e:
-                print(f"ERROR: Chunk {chunk_start:,}-{chunk_end:,} failed: {e}")
+                print(f"ERROR: Chunks {batch[0][0]:,}-{batch[-1][1]:,} failed: {e}")
+                continue
+            
+            for (chunk_start, chunk_end), chunk_rows in zip(batch, batch_rows):
+                if isinstance(chunk_rows, Exception):
+                    print(f"ERROR: Chunk {chunk_start:,}-{chunk_end:,} failed: {chunk_rows}")
+                    continue
+                total_rows += len(chunk_rows)
+                if sink is not None:
+                    sink(chunk_rows)
+                else:
+                    results[chunk_start] = chunk_rows
+                print(f"Completed {chunk_start:,}-{chunk_end:,}: Total so far {total_rows:,}/{want:,}")
+    
+    if sink is not None:
+        return total_rows
     
-    # Sort by article number since parallel fetching may return out of order
-    all_rows.sort(key=lambda x: x['artnum'])
+    # Chunks complete out of order, but each one is already sorted and they
+    # don't overlap, so joining them by start number orders every row
+    all_rows = ArticleColumns()
+    for chunk_start in sorted(results):
+        all_rows.extend(results[chunk_start])
     
     return all_rows
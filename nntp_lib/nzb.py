@@ -1,11 +1,44 @@
 """NZB file creation from stored articles."""
 
+import os
 import re
 import sqlite3
 import time
 import xml.etree.ElementTree as ET
-from xml.dom import minidom
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
+from typing import Iterable, Iterator, NamedTuple
+from .db import connect_db, close_db, fts_ready
+
+NZB_DOCTYPE = '<!DOCTYPE nzb PUBLIC "-//newzbin//DTD NZB 1.1//EN" "http://www.newzbin.com/DTD/nzb/nzb-1.1.dtd">'
+
+class Article(NamedTuple):
+    """One article row as read for NZB building."""
+    message_id: str
+    subject: str
+    from_addr: str
+    date_epoch: int | None
+    bytes: int | None
+    artnum: int
+    group_name: str
+
+# Columns selected for NZB building, in Article field order
+ARTICLE_COLUMNS = ", ".join(Article._fields)
+# Rows fetched from the cursor per batch
+FETCH_BATCH_ROWS = 10_000
+
+# Part counters: (n/m), [n/m], {n/m} and 'part n of m'
+_PAT_NM = re.compile(r'[(\[{](\d+)/(\d+)[)\]}]')
+_PAT_PART_OF = re.compile(r'\bpart\s+(\d+)\s+of\s+(\d+)\b', re.IGNORECASE)
+_PAT_YENC = re.compile(r'\byEnc\b', re.IGNORECASE)
+# All three at once, for parse_subject; the lookahead rejects most positions
+# before any alternative is tried
+_PAT_COUNTER = re.compile(r'(?=[(\[{py])(?:[(\[{](\d+)/(\d+)[)\]}]|\bpart\s+(\d+)\s+of\s+(\d+)\b|\byEnc\b)',
+                          re.IGNORECASE)
 
 def normalize_subject_base(subject: str) -> str:
     """
@@ -13,62 +46,130 @@ def normalize_subject_base(subject: str) -> str:
     to produce a "base" subject for grouping multi-part posts.
     """
     s = subject
-    s = re.sub(r'[(\[{]\d+/\d+[)\]}]', '', s)
-    s = re.sub(r'\bpart\s+\d+\s+of\s+\d+\b', '', s, flags=re.IGNORECASE)
-    s = re.sub(r'\byEnc\b', '', s, flags=re.IGNORECASE)
+    s = _PAT_NM.sub('', s)
+    s = _PAT_PART_OF.sub('', s)
+    s = _PAT_YENC.sub('', s)
     return s.strip()
 
 def extract_nm_leftmost(subject: str) -> tuple[int, int] | None:
     """Extract (n, m) from leftmost occurrence of (n/m) or [n/m] or {n/m}."""
-    pattern = r'[(\[{](\d+)/(\d+)[)\]}]'
-    match = re.search(pattern, subject)
+    match = _PAT_NM.search(subject) or _PAT_PART_OF.search(subject)
     if match:
         return (int(match.group(1)), int(match.group(2)))
-    match2 = re.search(r'\bpart\s+(\d+)\s+of\s+(\d+)\b', subject, flags=re.IGNORECASE)
-    if match2:
-        return (int(match2.group(1)), int(match2.group(2)))
     return None
 
 def extract_nm_rightmost(subject: str) -> tuple[int, int] | None:
     """Extract (n, m) from rightmost occurrence of (n/m) or [n/m] or {n/m}."""
-    pattern = r'[(\[{](\d+)/(\d+)[)\]}]'
-    matches = list(re.finditer(pattern, subject))
-    if matches:
-        match = matches[-1]
-        return (int(match.group(1)), int(match.group(2)))
-    matches2 = list(re.finditer(r'\bpart\s+(\d+)\s+of\s+(\d+)\b', subject, flags=re.IGNORECASE))
-    if matches2:
-        match2 = matches2[-1]
-        return (int(match2.group(1)), int(match2.group(2)))
+    for pattern in (_PAT_NM, _PAT_PART_OF):
+        match = None
+        for match in pattern.finditer(subject):
+            pass
+        if match:
+            return (int(match.group(1)), int(match.group(2)))
     return None
 
-def _group_with_picker(rows: list[dict], picker_fn) -> tuple[dict, list]:
+def _is_word_char(c: str) -> bool:
+    """Whether c counts as a word character for the \\b in the patterns above."""
+    return c.isalnum() or c == '_'
+
+def _joins_word_chars(subject: str, spans: list[tuple[int, int, int]], level: int) -> bool:
+    """Whether cutting the spans of at most `level` leaves two word characters adjacent."""
+    def joined(start, end):
+        return 0 < start and end < len(subject) and _is_word_char(subject[start - 1]) and _is_word_char(subject[end])
+    
+    run_start = run_end = None
+    for start, end, span_level in spans:
+        if span_level > level:
+            continue
+        if start != run_end:
+            if run_start is not None and joined(run_start, run_end):
+                return True
+            run_start = start
+        run_end = end
+    return run_start is not None and joined(run_start, run_end)
+
+def parse_subject(subject: str) -> tuple[str, tuple[int, int] | None, tuple[int, int] | None]:
     """
-    Group rows by (base_subject, m, poster).
-    Returns ({ (base, m, poster): [rows] }, [singles])
+    Parse a subject in one scan.
+    
+    Returns:
+        (base, leftmost (n, m), rightmost (n, m)), the same values as
+        normalize_subject_base, extract_nm_leftmost and extract_nm_rightmost
     """
-    groups = {}
-    singles = []
-    for r in rows:
-        subj = r["subject"] or ""
-        poster = r["from_addr"] or ""
-        nm = picker_fn(subj)
-        if nm is None:
-            singles.append(r)
-            continue
-        n, m = nm
-        base = normalize_subject_base(subj)
-        key = (base, m, poster)
-        groups.setdefault(key, []).append(r)
-    return groups, singles
+    first_nm = last_nm = first_part = last_part = None
+    spans = []
+    for match in _PAT_COUNTER.finditer(subject):
+        if match.group(1):
+            last_nm = match
+            first_nm = first_nm or match
+            level = 0
+        elif match.group(3):
+            last_part = match
+            first_part = first_part or match
+            level = 1
+        else:
+            level = 2
+        spans.append((*match.span(), level))
+    
+    if first_nm:
+        left = (int(first_nm.group(1)), int(first_nm.group(2)))
+        right = (int(last_nm.group(1)), int(last_nm.group(2)))
+    elif first_part:
+        left = (int(first_part.group(3)), int(first_part.group(4)))
+        right = (int(last_part.group(3)), int(last_part.group(4)))
+    else:
+        left = right = None
+    
+    if not spans:
+        return subject.strip(), left, right
+    
+    pieces = []
+    pos = 0
+    for start, end, _ in spans:
+        pieces.append(subject[pos:start])
+        pos = end
+    pieces.append(subject[pos:])
+    base = ''.join(pieces)
+    # normalize_subject_base strips each pattern from the previous one's
+    # output. Cutting a counter from between two word characters, or splicing
+    # a new counter together, changes what the later patterns see, so those
+    # rare subjects take the sequential path.
+    if _joins_word_chars(subject, spans, 0) or _joins_word_chars(subject, spans, 1) or _PAT_COUNTER.search(base):
+        return normalize_subject_base(subject), left, right
+    return base.strip(), left, right
 
-def group_rows_auto(rows: list[dict]) -> tuple[dict, list]:
+def group_rows_auto(rows: Iterable[Article]) -> tuple[dict, list]:
     """
     Auto-select leftmost or rightmost strategy for (n/m).
-    Returns ({ (base, m, poster): [rows] }, [singles])
+    Groups rows by (base_subject, m, poster) under both strategies in one pass.
+    Returns ({ (base, m, poster): [(n, row)] }, [singles])
     """
-    groups_left, singles_left = _group_with_picker(rows, extract_nm_leftmost)
-    groups_right, singles_right = _group_with_picker(rows, extract_nm_rightmost)
+    # The rightmost grouping is only built once a subject's two counters
+    # disagree on m; until then it would be a copy of the leftmost one
+    groups_left, groups_right, singles = {}, None, []
+    for r in rows:
+        poster = r.from_addr or ""
+        base, left, right = parse_subject(r.subject or "")
+        if left is None:
+            singles.append(r)
+            continue
+        if base[-4:].lower() == '.exe':
+            # Never written to an NZB, so keep them out of the groups (and
+            # the strategy scores) altogether
+            continue
+        # Segment numbers always come from the rightmost counter (the yEnc
+        # part), whichever counter the strategy groups on
+        part = (right[0], r)
+        if groups_right is None and left[1] != right[1]:
+            groups_right = {key: list(parts) for key, parts in groups_left.items()}
+        groups_left.setdefault((base, left[1], poster), []).append(part)
+        if groups_right is not None:
+            groups_right.setdefault((base, right[1], poster), []).append(part)
+    
+    if groups_right is None:
+        # Both strategies grouped identically; ties go to leftmost
+        print(f"Using leftmost strategy: {len(groups_left)} groups")
+        return groups_left, singles
     
     def score_groups(groups_dict):
         total_parts = sum(len(parts) for parts in groups_dict.values())
@@ -80,10 +181,99 @@ def group_rows_auto(rows: list[dict]) -> tuple[dict, list]:
     
     if score_right > score_left:
         print(f"Using rightmost strategy: {len(groups_right)} groups")
-        return groups_right, singles_right
+        return groups_right, singles
     else:
         print(f"Using leftmost strategy: {len(groups_left)} groups")
-        return groups_left, singles_left
+        return groups_left, singles
+
+def _iter_rows(cur: sqlite3.Cursor) -> Iterator[tuple]:
+    """Yield a query's rows, fetched `cur.arraysize` at a time."""
+    while True:
+        batch = cur.fetchmany()
+        if not batch:
+            return
+        yield from batch
+
+def _contains_clause(column: str, term: str, use_fts: bool) -> tuple[str, list]:
+    """WHERE clause and params for `column` containing `term`, ignoring case.
+    
+    With use_fts, the articles_fts trigram index narrows the candidates first.
+    The LIKE is still applied to them, so results are the same either way.
+    Trigrams need at least 3 characters, and LIKE wildcards in the term
+    have no index equivalent; such terms use the LIKE alone.
+    """
+    clause = f"{column} LIKE ? COLLATE NOCASE"
+    params = [f"%{term}%"]
+    if use_fts and len(term) >= 3 and '%' not in term and '_' not in term:
+        phrase = term.replace('"', '""')
+        clause = f"rowid IN (SELECT rowid FROM articles_fts WHERE articles_fts MATCH ?) AND {clause}"
+        params.insert(0, f'{column} : "{phrase}"')
+    return clause, params
+
+@lru_cache(maxsize=64)
+def _compile_any(pattern: str) -> re.Pattern:
+    # ASCII-only case folding, like LIKE ... COLLATE NOCASE
+    return re.compile(pattern, re.IGNORECASE | re.ASCII | re.DOTALL)
+
+def _matches_any(text: str | None, pattern: str) -> bool | None:
+    """SQL function matches_any(text, pattern); NULL text stays NULL, as with LIKE."""
+    if text is None:
+        return None
+    return _compile_any(pattern).search(text) is not None
+
+def _exclude_pattern(terms: str | None) -> str | None:
+    """Regex matching any of the '|'-separated LIKE terms, or None if there are none.
+    
+    One matches_any() call per row replaces a NOT LIKE per term; the LIKE
+    wildcards % and _ keep their meaning.
+    """
+    alternatives = []
+    for term in (terms or '').split('|'):
+        term = term.strip()
+        if term:
+            alternatives.append(''.join('.*' if c == '%' else '.' if c == '_' else re.escape(c)
+                                        for c in term))
+    return '|'.join(alternatives) or None
+
+def _filter_where(group: str, subject_terms: list[str], from_terms: list[str],
+                  not_subject: str | None, not_from: str | None,
+                  use_fts: bool) -> tuple[list[str], list]:
+    """WHERE clauses and params shared by the NZB queries."""
+    where = ["group_name = ?"]
+    params = [group]
+    
+    for column, terms in (("subject", subject_terms), ("from_addr", from_terms)):
+        for term in terms:
+            clause, clause_params = _contains_clause(column, term, use_fts)
+            where.append(clause)
+            params.extend(clause_params)
+    
+    for column, terms in (("subject", not_subject), ("from_addr", not_from)):
+        pattern = _exclude_pattern(terms)
+        if pattern:
+            where.append(f"NOT matches_any({column}, ?)")
+            params.append(pattern)
+    
+    return where, params
+
+def _select_sql(select: str, where: list[str], order_by: str) -> str:
+    """SQL text for one filter shape, shared by the single and grouped queries."""
+    return f"""
+        SELECT {select}
+        FROM articles
+        WHERE {' AND '.join(where)}
+        ORDER BY {order_by}
+    """
+
+def _display_sql(sql: str, params: list) -> str:
+    """Build actual SQL with parameters substituted for display, in one pass."""
+    pieces = sql.split('?')
+    out = [pieces[0]]
+    for param, piece in zip(params, pieces[1:]):
+        # Format string params with quotes, numbers without
+        out.append(f"'{param}'" if isinstance(param, str) else str(param))
+        out.append(piece)
+    return ''.join(out)
 
 def message_id_text(mid: str) -> str:
     """Format message ID for NZB (strip < > if present)."""
@@ -94,36 +284,31 @@ def message_id_text(mid: str) -> str:
         return mid[1:-1]
     return mid
 
-def build_nzb_xml(groups_dict: dict, singles: list[dict], group_name: str, 
+def build_nzb_xml(groups_dict: dict, singles: list[Article], group_name: str, 
                   require_complete_sets: bool = False) -> str:
-    """Build NZB XML from grouped articles."""
+    """Build NZB XML from grouped articles.
+    
+    Args:
+        groups_dict: { (base, m, poster): [(n, row)] } as returned by group_rows_auto
+    """
     root = ET.Element("nzb", xmlns="http://www.newzbin.com/DTD/2003/nzb")
     
     for (base, m, poster), parts in groups_dict.items():
-        # Check if set is complete (has all parts)
+        # Cheap checks first: set size, then extension (group_rows_auto
+        # already drops .exe sets; this covers dicts built elsewhere)
         if require_complete_sets and len(parts) < m:
             continue
-        if base.lower().endswith('.exe'):
+        if base[-4:].lower() == '.exe':
             continue
         
-        # Extract actual part numbers and check for gaps
-        part_numbers = set()
-        parts_with_numbers = []
-        for part in parts:
-            subj = part["subject"] or ""
-            # Try to extract part number from subject
-            nm = extract_nm_rightmost(subj) or extract_nm_leftmost(subj)
-            if nm:
-                n, _ = nm
-                part_numbers.add(n)
-                parts_with_numbers.append((n, part))
-        
-        # Check for gaps in part numbers
-        if part_numbers:
-            expected_parts = set(range(1, m + 1))
-            missing_parts = expected_parts - part_numbers
-            if missing_parts and require_complete_sets:
-                print(f"Skipping incomplete set '{base[:50]}...': missing parts {sorted(missing_parts)}")
+        # Check for gaps in the part numbers parsed while grouping. Counting
+        # the numbers in 1..m avoids building that range as a set unless the
+        # set is incomplete and the missing parts have to be reported
+        if require_complete_sets:
+            part_numbers = {n for n, _ in parts}
+            if sum(1 for n in part_numbers if 1 <= n <= m) < m:
+                missing_parts = sorted(set(range(1, m + 1)) - part_numbers)
+                print(f"Skipping incomplete set '{base[:50]}...': missing parts {missing_parts}")
                 continue
         
         file_el = ET.SubElement(root, "file", {
@@ -138,21 +323,15 @@ def build_nzb_xml(groups_dict: dict, singles: list[dict], group_name: str,
         segs_el = ET.SubElement(file_el, "segments")
         
         # Sort by actual part number, not article number
-        parts_with_numbers.sort(key=lambda x: x[0])
-        
-        for part_num, r in parts_with_numbers:
+        for part_num, r in sorted(parts, key=itemgetter(0)):
             ET.SubElement(segs_el, "segment", {
-                "bytes": str(r["bytes"] or 0),
+                "bytes": str(r.bytes or 0),
                 "number": str(part_num)  # Use actual part number from subject
-            }).text = message_id_text(r["message_id"])
+            }).text = message_id_text(r.message_id)
     
-    xml_str = ET.tostring(root, encoding='unicode')
-    dom = minidom.parseString(xml_str)
-    pretty = dom.toprettyxml(indent="  ")
-    
-    lines = pretty.split('\n')
-    lines.insert(1, '<!DOCTYPE nzb PUBLIC "-//newzbin//DTD NZB 1.1//EN" "http://www.newzbin.com/DTD/nzb/nzb-1.1.dtd">')
-    return '\n'.join(lines)
+    ET.indent(root, space="  ")
+    return (f'<?xml version="1.0" ?>\n{NZB_DOCTYPE}\n'
+            + ET.tostring(root, encoding='unicode') + '\n')
 
 def create_nzb_from_db(db_path: str, group: str,
                        subject_like: str = None,
@@ -161,185 +340,119 @@ def create_nzb_from_db(db_path: str, group: str,
                        not_from: str = None,
                        require_complete_sets: bool = False) -> str:
     """Query database and create NZB XML."""
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
+    conn = connect_db(db_path, read_only=True)
     cur = conn.cursor()
+    cur.arraysize = FETCH_BATCH_ROWS
     
-    where = ["group_name = ?"]
-    params = [group]
-    
-    if subject_like:
-        where.append("subject LIKE ? COLLATE NOCASE")
-        params.append(f"%{subject_like}%")
-    
-    if from_like:
-        where.append("from_addr LIKE ? COLLATE NOCASE")
-        params.append(f"%{from_like}%")
-    
-    if not_subject:
-        for term in not_subject.split('|'):
-            term = term.strip()
-            if term:
-                where.append("subject NOT LIKE ? COLLATE NOCASE")
-                params.append(f"%{term}%")
-    
-    if not_from:
-        for term in not_from.split('|'):
-            term = term.strip()
-            if term:
-                where.append("from_addr NOT LIKE ? COLLATE NOCASE")
-                params.append(f"%{term}%")
-    
-    sql = f"""
-        SELECT message_id, subject, from_addr, date_utc, bytes, artnum, group_name
-        FROM articles
-        WHERE {' AND '.join(where)}
-        ORDER BY artnum
-    """
+    use_fts = fts_ready(conn)
+    conn.create_function("matches_any", 2, _matches_any, deterministic=True)
     
-    # Build actual SQL with parameters substituted for display
-    display_sql = sql
-    for param in params:
-        # Format string params with quotes, numbers without
-        if isinstance(param, str):
-            display_sql = display_sql.replace('?', f"'{param}'", 1)
-        else:
-            display_sql = display_sql.replace('?', str(param), 1)
+    where, params = _filter_where(group,
+                                  [subject_like] if subject_like else [],
+                                  [from_like] if from_like else [],
+                                  not_subject, not_from, use_fts)
+    sql = _select_sql(ARTICLE_COLUMNS, where, "artnum")
     
     print(f"\nExecuting SQL Query:")
-    print(display_sql)
+    print(_display_sql(sql, params))
     print()
     
     start_time = time.time()
     cur.execute(sql, tuple(params))
     
-    rows = [dict(r) for r in cur.fetchall()]
+    # Rows are grouped as they stream out of the cursor
+    groups_dict, singles = group_rows_auto(map(Article._make, _iter_rows(cur)))
     query_time = time.time() - start_time
-    conn.close()
+    close_db(conn)
     
-    print(f"Query execution time: {query_time:.4f} seconds")
+    print(f"Query and grouping time: {query_time:.4f} seconds")
     
-    if not rows:
+    found = len(singles) + sum(len(parts) for parts in groups_dict.values())
+    if not found:
         print(f"No rows found for group='{group}'")
         return ""
     
-    print(f"Found {len(rows):,} articles matching filters")
-    groups_dict, singles = group_rows_auto(rows)
+    print(f"Found {found:,} articles matching filters")
     print(f"Grouped into {len(groups_dict)} multi-part sets and {len(singles)} singles")
     
     return build_nzb_xml(groups_dict, singles, group, require_complete_sets)
 
-def create_grouped_nzbs_from_db(db_path: str, group: str, output_path: str,
-                                subject_like: str = None, from_like: str = None,
-                                not_subject: str = None, not_from: str = None,
-                                require_complete_sets: bool = False) -> list[tuple[str, str]]:
-    """Create separate NZB files grouped by poster and collection name.
+def _build_one(articles: list[Article], group_name: str, require_complete_sets: bool) -> str | None:
+    """Build the NZB for one collection, or None if it ends up with no files.
     
-    Returns:
-        List of (filename, nzb_xml) tuples for created NZBs
+    Runs in a worker process of create_grouped_nzbs_from_db.
     """
-    from collections import defaultdict
-    from .utils import normalize_subject_for_grouping, sanitize_filename
+    # Group articles within this collection
+    groups_dict, singles = group_rows_auto(articles)
+    if not groups_dict and not singles:
+        return None
+    
+    # Build NZB (this will print messages about skipped incomplete sets)
+    nzb_xml = build_nzb_xml(groups_dict, singles, group_name, require_complete_sets)
+    if not nzb_xml or '<file' not in nzb_xml:
+        return None
+    return nzb_xml
+
+def iter_grouped_nzbs_from_db(db_path: str, group: str, output_path: str,
+                              subject_like: str = None, from_like: str = None,
+                              not_subject: str = None, not_from: str = None,
+                              require_complete_sets: bool = False,
+                              workers: int | None = None) -> Iterator[tuple[str, int]]:
+    """Write separate NZB files grouped by poster and collection name.
     
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
+    Each NZB is written to output_path as soon as it is built, so memory use
+    does not grow with the number of collections.
     
-    where = ["group_name = ?"]
-    params = [group]
+    Args:
+        workers: processes building NZBs in parallel (default: CPU count)
     
-    if subject_like:
-        for term in subject_like.split('%'):
-            if term:
-                where.append("subject LIKE ? COLLATE NOCASE")
-                params.append(f"%{term}%")
-    
-    if from_like:
-        for term in from_like.split('%'):
-            if term:
-                where.append("from_addr LIKE ? COLLATE NOCASE")
-                params.append(f"%{term}%")
-    
-    if not_subject:
-        for term in not_subject.split('|'):
-            term = term.strip()
-            if term:
-                where.append("subject NOT LIKE ? COLLATE NOCASE")
-                params.append(f"%{term}%")
-    
-    if not_from:
-        for term in not_from.split('|'):
-            term = term.strip()
-            if term:
-                where.append("from_addr NOT LIKE ? COLLATE NOCASE")
-                params.append(f"%{term}%")
-    
-    where_clause = " AND ".join(where)
-    sql = f"""
-        SELECT message_id, subject, from_addr, date_utc, bytes, artnum, group_name
-        FROM articles
-        WHERE {where_clause}
-        ORDER BY from_addr, subject, artnum
+    Yields:
+        (filename, size_in_bytes) for each NZB written
     """
+    from collections import defaultdict
+    from .utils import normalize_subject_for_grouping, sanitize_filename
     
-    # Build actual SQL with parameters substituted for display
-    display_sql = sql
-    for param in params:
-        # Format string params with quotes, numbers without
-        if isinstance(param, str):
-            display_sql = display_sql.replace('?', f"'{param}'", 1)
-        else:
-            display_sql = display_sql.replace('?', str(param), 1)
+    conn = connect_db(db_path, read_only=True)
+    cur = conn.cursor()
+    cur.arraysize = FETCH_BATCH_ROWS
+    
+    use_fts = fts_ready(conn)
+    conn.create_function("matches_any", 2, _matches_any, deterministic=True)
+    
+    where, params = _filter_where(group,
+                                  [t for t in (subject_like or '').split('%') if t],
+                                  [t for t in (from_like or '').split('%') if t],
+                                  not_subject, not_from, use_fts)
+    # The collection key is computed by SQLite so rows arrive already ordered
+    # by (poster, collection); subject, artnum keeps the old in-collection order
+    conn.create_function("norm_subj", 2, normalize_subject_for_grouping, deterministic=True)
+    params.insert(0, subject_like or "")
+    sql = _select_sql(f"norm_subj(subject, ?) AS collection, {ARTICLE_COLUMNS}", where,
+                      "from_addr, collection, subject, artnum")
     
     print(f"\nExecuting SQL Query:")
-    print(display_sql)
+    print(_display_sql(sql, params))
     print()
     
     start_time = time.time()
     print(f"Querying database...")
     cur.execute(sql, params)
-    rows = [dict(r) for r in cur.fetchall()]
-    query_time = time.time() - start_time
-    conn.close()
     
-    print(f"Query execution time: {query_time:.4f} seconds")
-    
-    if not rows:
-        print(f"No articles found")
-        return []
-    
-    print(f"Found {len(rows):,} articles")
-    
-    # Group by poster and normalized collection name
-    collections = defaultdict(list)
-    
-    for row in rows:
-        poster = row['from_addr']
-        normalized = normalize_subject_for_grouping(row['subject'], subject_like)
-        key = (poster, normalized)
-        collections[key].append(row)
-    
-    print(f"Grouped into {len(collections)} collections")
-    
-    # Create NZB for each collection
-    results = []
+    # Create NZB for each (poster, collection) run of rows as it streams in.
+    # Builds run in worker processes; results are taken in submission order
+    # so filenames are numbered the same on every run, and at most two
+    # collections per worker are in flight.
+    created = 0
     filename_counts = defaultdict(int)
     skipped_count = 0
+    found = 0
+    collection_count = 0
     
-    for (poster, collection_name), articles in collections.items():
-        # Group articles within this collection
-        groups_dict, singles = group_rows_auto(articles)
-        
-        if not groups_dict and not singles:
+    def finish(poster, collection_name, article_count, nzb_xml):
+        nonlocal skipped_count, created
+        if nzb_xml is None:
             skipped_count += 1
-            continue
-        
-        # Build NZB (this will print messages about skipped incomplete sets)
-        nzb_xml = build_nzb_xml(groups_dict, singles, group, require_complete_sets)
-        
-        if not nzb_xml or '<file' not in nzb_xml:
-            skipped_count += 1
-            continue
+            return None
         
         # Create filename from collection name and poster
         poster_clean = sanitize_filename(poster[:30])
@@ -354,10 +467,67 @@ def create_grouped_nzbs_from_db(db_path: str, group: str, output_path: str,
         else:
             filename = f"{base_filename}.nzb"
         
-        results.append((filename, nzb_xml))
-        print(f"  Created: {filename} ({len(articles)} articles)")
+        output_file = os.path.join(output_path, filename)
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(nzb_xml)
+        created += 1
+        print(f"  Created: {filename} ({article_count} articles)")
+        return filename, os.path.getsize(output_file)
+    
+    workers = workers or os.cpu_count() or 1
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            in_flight = 2 * workers
+            pending = deque()
+            for (poster, collection_name), rows in groupby(_iter_rows(cur), key=itemgetter(3, 0)):
+                articles = [Article._make(row[1:]) for row in rows]
+                found += len(articles)
+                collection_count += 1
+                
+                future = executor.submit(_build_one, articles, group, require_complete_sets)
+                pending.append((poster, collection_name, len(articles), future))
+                if len(pending) >= in_flight:
+                    poster, collection_name, article_count, future = pending.popleft()
+                    written = finish(poster, collection_name, article_count, future.result())
+                    if written:
+                        yield written
+            
+            while pending:
+                poster, collection_name, article_count, future = pending.popleft()
+                written = finish(poster, collection_name, article_count, future.result())
+                if written:
+                    yield written
+    finally:
+        close_db(conn)
+    print(f"Query, grouping and build time: {time.time() - start_time:.4f} seconds")
+    
+    if not found:
+        print(f"No articles found")
+        return
     
+    print(f"Found {found:,} articles in {collection_count} collections")
     if skipped_count > 0:
         print(f"\nSkipped {skipped_count} collections (empty or all incomplete sets)")
-    print(f"\nTotal NZBs created: {len(results)}")
-    return results
+    print(f"\nTotal NZBs created: {created}")
+
+
+def create_grouped_nzbs_from_db(db_path: str, group: str, output_path: str,
+                                subject_like: str = None, from_like: str = None,
+                                not_subject: str = None, not_from: str = None,
+                                require_complete_sets: bool = False,
+                                workers: int | None = None) -> list[tuple[str, int]]:
+    """Write separate NZB files grouped by poster and collection name.
+    
+    Collects iter_grouped_nzbs_from_db(); the NZBs are already on disk in
+    output_path when this returns.
+    
+    Returns:
+        List of (filename, size_in_bytes) tuples for created NZBs
+    """
+    return list(iter_grouped_nzbs_from_db(
+        db_path, group, output_path,
+        subject_like=subject_like, from_like=from_like,
+        not_subject=not_subject, not_from=not_from,
+        require_complete_sets=require_complete_sets,
+        workers=workers,
+    ))
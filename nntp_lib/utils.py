@@ -2,6 +2,7 @@
 
 from configparser import ConfigParser
 from email.utils import parsedate_to_datetime
+from functools import lru_cache
 import os
 import re
 import xml.etree.ElementTree as ET
@@ -10,6 +11,26 @@ from pathlib import Path
 # Configuration constants
 CONFIG_BASE_PATH = os.getenv('CONFIG_BASE_PATH', '/mnt/r/tmp/nzbindex')
 
+# Anything but letters, digits, space, '-' and '_' (\w matches exactly the
+# characters str.isalnum() accepts, plus '_')
+_PAT_UNSAFE_FILENAME = re.compile(r'[^\w \-]')
+
+# Patterns used by normalize_subject_for_grouping, in the order applied
+_PAT_FILE_NM = re.compile(r'\s*[\[\(]\d+/\d+[\]\)]\s*')
+_PAT_BRACKET_NUM = re.compile(r'\s*\[\d+\]\s*')
+_PAT_PAREN_NUM = re.compile(r'\s*\(\d+\)\s*')
+_PAT_QUOTED = re.compile(r'"[^"]*"')
+_PAT_EXT = re.compile(r'\.(jpg|jpeg|png|gif|bmp|tif|tiff|rar|zip|r\d+|par2?|nfo|sfv|txt|diz|mkv|avi|mp4|wmv|mov|mpg|mpeg|flv|webm|m4v)(\s|$)', re.IGNORECASE)
+_PAT_SIZE = re.compile(r'\d+\.?\d*\s*(kb|mb|gb|bytes?)\b', re.IGNORECASE)
+_PAT_SEP = re.compile(r'\s+[-\.]\s+')
+_DROP_QUOTES = str.maketrans('', '', '"\'')
+_PAT_YENC = re.compile(r'\s*yEnc\s*', re.IGNORECASE)
+# "File X of Y" is tried before the single special characters at each
+# position, so one pass gives the same result as removing it first
+_PAT_FILE_X_OF_Y_OR_SPECIAL = re.compile(r'\s*-?\s*File\s+\d+\s+of\s+\d+\s*-?\s*|[&\-\\/,.:;!?(){}[\]]', re.IGNORECASE)
+_PAT_TRAIL = re.compile(r'[\s\d_]+$')
+_PAT_WS = re.compile(r'\s+')
+
 def get_config() -> ConfigParser:
     """Load configuration from nzbindex.ini file."""
     config = ConfigParser()
@@ -34,30 +55,32 @@ def to_iso(dt_str: str | None) -> str | None:
 
 def sanitize_filename(s: str) -> str:
     """Make a string safe for use as a filename."""
-    return "".join(c if c.isalnum() or c in (' ', '-', '_') else '_' for c in s)
+    return _PAT_UNSAFE_FILENAME.sub('_', s)
 
 def normalize_subject_for_grouping(subject: str, search_term: str = None) -> str:
     """Normalize subject for grouping - aggressive normalization."""
-    s = subject
-    
-    # Remove [nnn/nnn] and (nnn/nnn) file number patterns
-    s = re.sub(r'\s*[\[\(]\d+/\d+[\]\)]\s*', ' ', s)
-    
+    # Remove [nnn/nnn] and (nnn/nnn) file number patterns. Every segment of
+    # a post is identical after this, so the remaining steps are cached.
+    return _normalize_collection(_PAT_FILE_NM.sub(' ', subject), search_term)
+
+@lru_cache(maxsize=200_000)
+def _normalize_collection(s: str, search_term: str | None) -> str:
+    """normalize_subject_for_grouping after the file number patterns are removed."""
     # Remove numbers in brackets like [000], [001], etc.
-    s = re.sub(r'\s*\[\d+\]\s*', ' ', s)
-    s = re.sub(r'\s*\(\d+\)\s*', ' ', s)
+    s = _PAT_BRACKET_NUM.sub(' ', s)
+    s = _PAT_PAREN_NUM.sub(' ', s)
     
     # Remove quoted filenames entirely (e.g., "filename.jpg")
-    s = re.sub(r'"[^"]*"', '', s)
+    s = _PAT_QUOTED.sub('', s)
     
     # Remove file extensions (before splitting)
-    s = re.sub(r'\.(jpg|jpeg|png|gif|bmp|tif|tiff|rar|zip|r\d+|par2?|nfo|sfv|txt|diz|mkv|avi|mp4|wmv|mov|mpg|mpeg|flv|webm|m4v)(\s|$)', ' ', s, flags=re.IGNORECASE)
+    s = _PAT_EXT.sub(' ', s)
     
     # Remove size indicators like "308.31 kB"
-    s = re.sub(r'\d+\.?\d*\s*(kb|mb|gb|bytes?)\b', '', s, flags=re.IGNORECASE)
+    s = _PAT_SIZE.sub('', s)
     
     # Split by " - " or " . " and take only the first part (the collection name)
-    s = re.split(r'\s+[-\.]\s+', s, maxsplit=1)[0].strip()
+    s = _PAT_SEP.split(s, maxsplit=1)[0].strip()
     
     # Remove search term if provided
     if search_term:
@@ -68,16 +91,13 @@ def normalize_subject_for_grouping(subject: str, search_term: str = None) -> str
                 s = re.sub(re.escape(term), '', s, flags=re.IGNORECASE)
     
     # Remove quotes
-    s = re.sub(r'["\']', '', s)
+    s = s.translate(_DROP_QUOTES)
     
     # Remove yEnc and similar markers
-    s = re.sub(r'\s*yEnc\s*', ' ', s, flags=re.IGNORECASE)
-    
-    # Remove "File X of Y" patterns
-    s = re.sub(r'\s*-?\s*File\s+\d+\s+of\s+\d+\s*-?\s*', ' ', s, flags=re.IGNORECASE)
+    s = _PAT_YENC.sub(' ', s)
     
-    # Remove special characters: &, -, \, /, etc.
-    s = re.sub(r'[&\-\\/,.:;!?(){}[\]]', ' ', s)
+    # Remove "File X of Y" patterns and special characters: &, -, \, /, etc.
+    s = _PAT_FILE_X_OF_Y_OR_SPECIAL.sub(' ', s)
     
     # Remove underscores from the last 10 characters
     if len(s) > 10:
@@ -86,10 +106,10 @@ def normalize_subject_for_grouping(subject: str, search_term: str = None) -> str
         s = s.replace('_', ' ')
     
     # Remove trailing numbers and spaces from the end
-    s = re.sub(r'[\s\d_]+$', '', s)
+    s = _PAT_TRAIL.sub('', s)
     
     # Collapse whitespace and remove leading/trailing spaces
-    s = re.sub(r'\s+', ' ', s).strip()
+    s = _PAT_WS.sub(' ', s).strip()
     
     # Truncate to 100 characters
     s = s[:100].strip()
@@ -123,7 +143,7 @@ def split_nzb(input_nzb: str, output_dir: str) -> int:
         # Get subject for filename
         subject = file_elem.get('subject', f'file_{idx}')
         # Sanitize filename
-        safe_name = "".join(c for c in subject[:80] if c.isalnum() or c in (' ', '_', '-')).strip()
+        safe_name = _PAT_UNSAFE_FILENAME.sub('', subject[:80]).strip()
         safe_name = safe_name or f'file_{idx}'
         
         output_file = output_path / f"{idx:05d}_{safe_name}.nzb"
@@ -1,18 +1,29 @@
 from nntp_lib.utils import get_config
-from nntp_lib.db import ensure_db, upsert_headers
-from nntp_lib.fetch import fetch_headers_chunked, get_nntp_client
+from nntp_lib.db import ArticleColumns, backup_db, connect_db, close_db, ensure_db, ensure_schema, ensure_indexes, drop_indexes, ensure_fts, set_bulk_load_pragmas, upsert_headers
+from nntp_lib.fetch import NNTPClientPool, fetch_headers_chunked
+from nntp_lib.archive import archive_path, open_archive, write_columns
 from find_date_range import find_article_range_by_dates
 from configparser import ConfigParser
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
 import sqlite3
 import time 
 import os
-import orjson
 
 # globals 
 config = get_config()
 ARCHIVE_ROWS_PATH_BASE = f"{config.get('db', 'DB_BASE_PATH', fallback='/tmp/nntp_archive')}/headers-archive"
+# Loads at least this large drop the secondary indexes and rebuild them afterwards
+REINDEX_THRESHOLD = config.getint('db', 'reindex_threshold', fallback=500_000)
+# Header archive compression: none, gzip, zstd (needs zstandard) or parquet (needs pyarrow)
+ARCHIVE_COMPRESSION = config.get('archive', 'compression', fallback='none')
+# Maintain the articles_fts trigram index used by subject/poster substring filters
+FTS_ENABLED = config.getboolean('db', 'fts', fallback=False)
+# Run each group in its own process instead of a thread
+GROUP_PROCESSES = config.getboolean('db', 'group_processes', fallback=False)
 
-def get_article_range(config: ConfigParser, group: str, local_min: int, local_max: int) -> tuple[int, int]:
+def get_article_range(config: ConfigParser, group: str, local_min: int, local_max: int,
+                      client=None, pool=None) -> tuple[int, int]:
     """
     Get article range based on date filters in config, or return server defaults.
     
@@ -21,6 +32,8 @@ def get_article_range(config: ConfigParser, group: str, local_min: int, local_ma
         group: Newsgroup name
         local_min: Current minimum article number in database
         local_max: Current maximum article number in database
+        client: Open NNTP connection for the date search (optional)
+        pool: Connection pool the date search may borrow a second connection from
     
     Returns:
         Tuple of (local_min, local_max) article numbers
@@ -41,7 +54,7 @@ def get_article_range(config: ConfigParser, group: str, local_min: int, local_ma
         
         if min_days > 0 and max_days > 0 and min_days < max_days:
             print(f"Finding articles between {min_days} and {max_days} days old...")
-            result = find_article_range_by_dates(group, min_days, max_days)
+            result = find_article_range_by_dates(group, min_days, max_days, client=client, pool=pool)
             
             if result:
                 lower_artnum, upper_artnum, lower_age, upper_age = result
@@ -56,45 +69,47 @@ def get_article_range(config: ConfigParser, group: str, local_min: int, local_ma
     return local_min, local_max
 
 
-if __name__ == '__main__':
-    print("="*80)
-    print("NNTP Indexer - Creating/Updating Article Database")
-    print("="*80)
-    
-    groups = config['groups']['names'].split(',')    
-    DB_BASE_PATH = config['db']['DB_BASE_PATH']
+def process_group(group: str, pool: NNTPClientPool, fetch_workers: int):
+    """
+    Fetch new headers for one group into its database.
     
-    print(f"\nGroups to process: {', '.join(groups)}")
-    print(f"Database path: {DB_BASE_PATH}\n")
+    Args:
+        group: Newsgroup name
+        pool: NNTP connection pool shared by all groups
+        fetch_workers: Number of threads fetching this group's chunks
+    """
+    print(f"\n{'='*80}")
+    print(f"Processing group: {group}")
+    print(f"{'='*80}")
 
-    for group in groups:
-        print(f"\n{'='*80}")
-        print(f"Processing group: {group}")
-        print(f"{'='*80}")
-
-        db_path = f"{DB_BASE_PATH}/{group}.sqlite"
-        disk_db_exists = os.path.exists(db_path)
-        if disk_db_exists:
-            print(f"Disk DB exists at {db_path}, upserting directly into disk DB...")
-            conn = sqlite3.connect(db_path)
-            ensure_db(conn)
-            # Get current max/min from disk DB
-            cur = conn.cursor()
-            cur.execute("SELECT COALESCE(MAX(artnum), 0), COALESCE(MIN(artnum), 0) FROM articles WHERE group_name = ?", (group,))
-            db_max, db_min = cur.fetchone()
-            print(f"Current disk DB range: {db_min:,} to {db_max:,}")
-            cur.close()
-        else:
-            print(f"No disk DB found for {group}, using in-memory DB and backing up to disk after upsert...")
-            conn = sqlite3.connect(':memory:')
-            ensure_db(conn)
-            db_max, db_min = 0, 0
+    db_path = f"{config['db']['DB_BASE_PATH']}/{group}.sqlite"
+    disk_db_exists = os.path.exists(db_path)
+    if disk_db_exists:
+        print(f"Disk DB exists at {db_path}, upserting directly into disk DB...")
+        conn = connect_db(db_path)
+        ensure_db(conn)
+        # Get current max/min from disk DB
+        cur = conn.cursor()
+        cur.execute("SELECT COALESCE(MAX(artnum), 0), COALESCE(MIN(artnum), 0) FROM articles WHERE group_name = ?", (group,))
+        db_max, db_min = cur.fetchone()
+        print(f"Current disk DB range: {db_min:,} to {db_max:,}")
+        cur.close()
+    else:
+        print(f"No disk DB found for {group}, using in-memory DB and backing up to disk after upsert...")
+        conn = connect_db(':memory:')
+        # Nothing to protect until the backup, and indexes are built once
+        # after the bulk load. A disk DB keeps WAL so it survives a crash
+        # and create_nzb.py can read it during the update.
+        set_bulk_load_pragmas(conn)
+        ensure_schema(conn)
+        db_max, db_min = 0, 0
 
+    # One pooled connection serves the group lookup and any date search, and
+    # goes back to the pool for the fetch
+    with pool.client() as client:
         # Get server's current article range
-        print("Connecting to NNTP server to check available articles...")
-        temp_client = get_nntp_client(config)
-        server_max, server_min = temp_client.group(group)[1:3]
-        temp_client.quit()
+        print("Checking available articles on the NNTP server...")
+        _, _, server_min, server_max, _ = client.group(group)
         print(f"Server article range: {server_min:,} to {server_max:,}")
 
         # Default: fetch new articles only (from db_max+1 to server_max)
@@ -102,57 +117,158 @@ if __name__ == '__main__':
         local_max = server_max
 
         # Apply filter overrides if configured
-        local_min, local_max = get_article_range(config, group, local_min, local_max)
+        local_min, local_max = get_article_range(config, group, local_min, local_max,
+                                               client=client, pool=pool)
 
-        # Check if there's anything to fetch
-        if local_min > local_max:
-            print(f"\n Database is up to date. No new articles to fetch.")
-            conn_mem.close()
-            continue
+    # Check if there's anything to fetch
+    if local_min > local_max:
+        print(f"\n Database is up to date. No new articles to fetch.")
+        close_db(conn)
+        return
 
-        total_to_fetch = local_max - local_min + 1
-        print(f"\nArticle range to fetch: {local_min:,} to {local_max:,}")
-        print(f"Total headers to retrieve: {total_to_fetch:,}")
-        print(f"Starting parallel fetch...\n")
+    total_to_fetch = local_max - local_min + 1
+    print(f"\nArticle range to fetch: {local_min:,} to {local_max:,}")
+    print(f"Total headers to retrieve: {total_to_fetch:,}")
+    print(f"Starting parallel fetch...\n")
 
-        start_time = time.time()
-        rows = fetch_headers_chunked(
-            config=config,
-            if rows:
-                cached_headers_file = f"{ARCHIVE_ROWS_PATH_BASE}/{group}.json"
-                os.makedirs(ARCHIVE_ROWS_PATH_BASE, exist_ok=True)
-
-                print(f"\nArchiving headers to JSON...")
-                start_time = time.time()
-                with open(cached_headers_file, "wb") as f:  # Open in binary mode for orjson
-                    f.write(b'\n'.join(orjson.dumps(row) for row in rows))
-                    f.write(b'\n')
-                end_time = time.time()
-                print(f"\u2713 Wrote {len(rows):,} rows to {cached_headers_file} in {end_time - start_time:.4f} seconds")
-
-                print(f"\nInserting headers into database...")
-                start_time = time.time()
-                upsert_headers(conn, group, rows)
-                end_time = time.time()
-                print(f"\u2713 Upserted {len(rows):,} headers into DB in {end_time - start_time:.4f} seconds")
-
-                if not disk_db_exists:
-                    print(f"\nBacking up in-memory DB to disk DB at {db_path}...")
-                    start_time = time.time()
-                    conn_disk = sqlite3.connect(db_path)
-                    conn.backup(conn_disk)
-                    conn_disk.close()
-                    end_time = time.time()
-                    print(f"\u2713 Backed up in-memory DB to disk DB in {end_time - start_time:.4f} seconds")
-            else:
-                print("\nNo new headers to process.")
+    if disk_db_exists and total_to_fetch >= REINDEX_THRESHOLD:
+        print(f"Dropping indexes for bulk load of {total_to_fetch:,} headers...")
+        drop_indexes(conn)
+
+    # The archive is the recovery source for upsert_from_json.py when the DB
+    # is built in memory. An existing disk DB is updated in WAL mode with
+    # synchronous=NORMAL (see connect_db), so it survives a crash on its own.
+    archive_enabled = config.getboolean('archive', 'enabled', fallback=not disk_db_exists)
+    cached_headers_file = archive_path(ARCHIVE_ROWS_PATH_BASE, group, ARCHIVE_COMPRESSION)
+
+    # Each chunk is archived and inserted as soon as it arrives, all inside
+    # one transaction, so memory stays bounded by the chunk size. The archive
+    # is written on a background thread while the same chunk is upserted;
+    # at most one chunk waits to be archived. It is only opened (and the
+    # previous one replaced) once there are rows to write.
+    start_time = time.time()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        with ExitStack() as stack, ThreadPoolExecutor(max_workers=1) as archive_writer:
+            archive = None
+            archive_pending = None
 
-            conn.close()
-            print(f"\n\u2713 Completed processing for {group}")
-            end_time = time.time()
-            print(f" Backed up in-memory DB to disk DB in {end_time - start_time:.4f} seconds")
+            def store_chunk(rows: ArticleColumns):
+                nonlocal archive, archive_pending
+                if archive_enabled and rows:
+                    if archive is None:
+                        archive = stack.enter_context(open_archive(cached_headers_file, ARCHIVE_COMPRESSION))
+                    elif archive_pending is not None:
+                        archive_pending.result()
+                    archive_pending = archive_writer.submit(write_columns, archive, rows, group)
+                upsert_headers(conn, group, rows, commit=False)
+
+            total_rows = fetch_headers_chunked(
+                config=config,
+                group=group,
+                start=local_max,
+                back_filled_up_to=local_min,
+                sink=store_chunk,
+                pool=pool,
+                max_workers=fetch_workers,
+            )
+            if archive_pending is not None:
+                archive_pending.result()
+        conn.commit()
+    except BaseException:
+        # Release the write lock before the error moves on to the next group
+        conn.rollback()
+        close_db(conn)
+        raise
+    end_time = time.time()
+
+    archived = f", archived to {cached_headers_file}" if archive is not None else ""
+    print(f"\u2713 Fetched{archived} and upserted {total_rows:,} headers "
+          f"in {end_time - start_time:.4f} seconds")
+
+    # No-op unless the indexes were deferred or dropped for this load
+    print(f"\nBuilding indexes...")
+    start_time = time.time()
+    ensure_indexes(conn)
+    end_time = time.time()
+    print(f"\u2713 Built indexes in {end_time - start_time:.4f} seconds")
+
+    if FTS_ENABLED:
+        print(f"\nUpdating subject/poster search index...")
+        start_time = time.time()
+        if ensure_fts(conn):
+            print(f"\u2713 Updated search index in {time.time() - start_time:.4f} seconds")
         else:
-            print("\nNo new headers to process.")
+            print(f"SQLite {sqlite3.sqlite_version} has no trigram tokenizer (3.34+ needed), skipping")
+
+    if not total_rows:
+        print("\nNo new headers to process.")
+    elif not disk_db_exists:
+        print(f"\nBacking up in-memory DB to disk DB at {db_path}...")
+        start_time = time.time()
+        backup_db(conn, db_path)
+        end_time = time.time()
+        print(f"\u2713 Backed up in-memory DB to disk DB in {end_time - start_time:.4f} seconds")
+
+    close_db(conn)
+    print(f"\n\u2713 Completed processing for {group}")
+
+
+def process_group_in_worker(group: str, connections: int, fetch_workers: int):
+    """
+    process_group for a worker process, which can't share the parent's pool.
+    
+    Args:
+        group: Newsgroup name
+        connections: Size of this process's own NNTP connection pool
+        fetch_workers: Number of threads fetching this group's chunks
+    """
+    with NNTPClientPool(config, connections) as pool:
+        process_group(group, pool, fetch_workers)
+
+
+if __name__ == '__main__':
+    print("="*80)
+    print("NNTP Indexer - Creating/Updating Article Database")
+    print("="*80)
+    
+    groups = config['groups']['names'].split(',')    
+    DB_BASE_PATH = config['db']['DB_BASE_PATH']
+    
+    print(f"\nGroups to process: {', '.join(groups)}")
+    print(f"Database path: {DB_BASE_PATH}\n")
 
-        conn_mem.close()
-        print(f"\n Completed processing for {group}")
\ No newline at end of file
+    # Created once here rather than checked again for every group
+    os.makedirs(ARCHIVE_ROWS_PATH_BASE, exist_ok=True)
+
+    # Groups are processed concurrently and split the connection budget, so
+    # small groups don't leave most of the server connections idle
+    max_workers = config.getint('servers', 'max_workers', fallback=5)
+    group_workers = max(1, min(len(groups), max_workers))
+    if GROUP_PROCESSES:
+        # Parsing and inserting are CPU-bound and threads share one core's
+        # worth of GIL; processes use more cores but can't share a pool, so
+        # each gets a fixed slice of the connection budget
+        group_workers = max(1, min(group_workers, os.cpu_count() or 1))
+    fetch_workers = max(1, max_workers // group_workers)
+
+    with ExitStack() as stack:
+        if GROUP_PROCESSES:
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=group_workers))
+            future_to_group = {
+                executor.submit(process_group_in_worker, group, fetch_workers, fetch_workers): group
+                for group in groups
+            }
+        else:
+            pool = stack.enter_context(NNTPClientPool(config, max_workers))
+            executor = stack.enter_context(ThreadPoolExecutor(max_workers=group_workers))
+            future_to_group = {
+                executor.submit(process_group, group, pool, fetch_workers): group
+                for group in groups
+            }
+        for future in as_completed(future_to_group):
+            group = future_to_group[future]
+            try:
+                future.result()
+            except Exception as e:
+                print(f"ERROR: Processing {group} failed: {e}")
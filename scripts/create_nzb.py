@@ -17,6 +17,7 @@ def main():
     not_from = config.get('filters', 'not_from', fallback=None)
     require_complete = config.getboolean('nzb', 'require_complete_sets', fallback=False)
     group_by_collection = config.getboolean('nzb', 'group_by_collection', fallback=False)
+    workers = config.getint('nzb', 'workers', fallback=0) or None
     
     Path(NZB_OUTPUT_PATH).mkdir(parents=True, exist_ok=True)
     
@@ -27,8 +28,9 @@ def main():
         db_path = f"{DB_BASE_PATH}/{group}.sqlite"
         
         if group_by_collection:
-            # Create separate NZBs grouped by poster and collection
-            nzb_list = create_grouped_nzbs_from_db(
+            # Create separate NZBs grouped by poster and collection;
+            # each one is written to NZB_OUTPUT_PATH as it is built
+            create_grouped_nzbs_from_db(
                 db_path=db_path,
                 group=group,
                 output_path=NZB_OUTPUT_PATH,
@@ -36,14 +38,9 @@ def main():
                 from_like=from_like,
                 not_subject=not_subject,
                 not_from=not_from,
-                require_complete_sets=require_complete
+                require_complete_sets=require_complete,
+                workers=workers
             )
-            
-            # Write all NZBs to disk
-            for filename, nzb_xml in nzb_list:
-                output_file = f"{NZB_OUTPUT_PATH}/{filename}"
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    f.write(nzb_xml)
         else:
             # Create single NZB with all matching articles
             nzb_xml = create_nzb_from_db(
@@ -1,38 +1,103 @@
 from nntp_lib.utils import get_config
-from nntp_lib.fetch import get_nntp_client
+from nntp_lib.fetch import NNTPClientPool, get_nntp_client, parse_overview_date
 from email.utils import parsedate_to_datetime
 from datetime import datetime, timedelta, timezone
-import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from bisect import bisect_left, bisect_right
+import nntplib
+import threading
+
+# Once a search is down to this many articles, their dates are fetched with
+# one XHDR request and the rest of the search runs locally
+XHDR_WINDOW = 2048
+
+# Article dates never change, so probe results are kept per (group, artnum),
+# up to this many; past that the oldest are dropped so searching many groups
+# in one process doesn't grow the cache without bound
+ARTICLE_DATE_CACHE_SIZE = 4096
+_article_dates: dict[tuple[str, int], datetime | None] = {}
+# Both bounds may be searched at once from different threads
+_article_dates_lock = threading.Lock()
+
+def _cache_article_date(key: tuple[str, int], dt: datetime | None):
+    """Remember an article's date, evicting the oldest entry if the cache is full."""
+    with _article_dates_lock:
+        _article_dates[key] = dt
+        if len(_article_dates) > ARTICLE_DATE_CACHE_SIZE:
+            # Dicts keep insertion order, so the first key is the oldest
+            del _article_dates[next(iter(_article_dates))]
 
 def get_article_date(nntp_client, group: str, artnum: int) -> datetime | None:
-    """Fetch a single article's date by article number."""
+    """Fetch a single article's date by article number (cached)."""
+    key = (group, artnum)
+    try:
+        # The other bound's search may evict the key at any point
+        return _article_dates[key]
+    except KeyError:
+        pass
     try:
         # Use xover to get overview data for a single article
         resp, overviews = nntp_client.over((artnum, artnum))
-        if not overviews:
-            return None
-        
-        # overviews is a list of (artnum, overview_dict) tuples
-        _, ov = overviews[0]
-        date_str = ov.get('date') or ov.get('Date')
-        if not date_str:
-            return None
-        
-        return parsedate_to_datetime(date_str).astimezone(timezone.utc)
+        dt = None
+        if overviews:
+            # overviews is a list of (artnum, overview_dict) tuples
+            _, ov = overviews[0]
+            date_str = ov.get('date') or ov.get('Date')
+            if date_str:
+                dt = parsedate_to_datetime(date_str).astimezone(timezone.utc)
     except Exception as e:
+        # Not cached: the error may be transient
         print(f"Error fetching article {artnum}: {e}")
         return None
+    _cache_article_date(key, dt)
+    return dt
 
 def days_old(dt: datetime) -> float:
     """Calculate how many days old a datetime is from now."""
     now = datetime.now(timezone.utc)
     return (now - dt).total_seconds() / 86400
 
+def _xhdr_date_boundary(nntp_client, group: str, low: int, high: int,
+                        target_days: int, find_lower: bool) -> tuple[int, datetime] | None:
+    """Finish a date search over articles low..high from a single XHDR Date reply.
+    
+    Returns:
+        (artnum, date) of the boundary article, or None if no article in
+        the window is on the wanted side of target_days
+    """
+    _, headers = nntp_client.xhdr('Date', f'{low}-{high}')
+    # Plain epoch seconds via the overview date parser; a datetime is only
+    # built for the article that is returned
+    artnums, epochs = [], []
+    for num, date_str in headers:
+        epoch = parse_overview_date(date_str.encode('utf-8', 'ignore'))
+        if epoch is not None:
+            artnums.append(int(num))
+            epochs.append(epoch)
+    print(f"  Articles {low}-{high}: {len(artnums)} dates from XHDR")
+    
+    # Dates rise with article number; older than target_days means before cutoff
+    cutoff = datetime.now(timezone.utc).timestamp() - target_days * 86400
+    if find_lower:
+        i = bisect_right(epochs, cutoff) - 1
+    else:
+        i = bisect_left(epochs, cutoff)
+    if not 0 <= i < len(artnums):
+        return None
+    dt = datetime.fromtimestamp(epochs[i], timezone.utc)
+    _cache_article_date((group, artnums[i]), dt)
+    return artnums[i], dt
+
 def binary_search_date_boundary(nntp_client, group: str, low: int, high: int, 
-                                target_days: int, find_lower: bool = True) -> int:
+                                target_days: int, find_lower: bool = True,
+                                use_xhdr: bool = True) -> tuple[int, datetime | None]:
     """
     Binary search to find article number closest to target_days old.
     
+    Probes one article per round-trip until at most XHDR_WINDOW remain,
+    then finishes with a single XHDR request (if the server supports it).
+    
     Args:
         nntp_client: NNTP connection
         group: newsgroup name
@@ -41,13 +106,27 @@ def binary_search_date_boundary(nntp_client, group: str, low: int, high: int,
         target_days: target age in days
         find_lower: if True, find article just OLDER than target_days
                    if False, find article just YOUNGER than target_days
+        use_xhdr: if False, probe one article at a time all the way down
     
     Returns:
-        Article number closest to the boundary
+        (article number closest to the boundary, its date or None if it
+        was never probed)
     """
     result = low if find_lower else high
+    result_dt = None
     
     while low <= high:
+        if use_xhdr and high - low < XHDR_WINDOW:
+            try:
+                found = _xhdr_date_boundary(nntp_client, group, low, high, target_days, find_lower)
+            except nntplib.NNTPError as e:
+                print(f"  XHDR failed ({e}), probing one article at a time")
+                use_xhdr = False
+            else:
+                if found:
+                    result, result_dt = found
+                break
+        
         mid = (low + high) // 2
         dt = get_article_date(nntp_client, group, mid)
         
@@ -65,23 +144,22 @@ def binary_search_date_boundary(nntp_client, group: str, low: int, high: int,
         if find_lower:
             # Looking for articles >= target_days (older)
             if age >= target_days:
-                result = mid
+                result, result_dt = mid, dt
                 low = mid + 1  # Search for even older
             else:
                 high = mid - 1
         else:
             # Looking for articles <= target_days (younger)
             if age <= target_days:
-                result = mid
+                result, result_dt = mid, dt
                 high = mid - 1  # Search for even younger
             else:
                 low = mid + 1
-        
-        time.sleep(0.1)  # Be nice to the server
     
-    return result
+    return result, result_dt
 
-def find_article_range_by_dates(group: str, min_days: int, max_days: int) -> tuple[int, int] | None:
+def find_article_range_by_dates(group: str, min_days: int, max_days: int,
+                                client=None, pool=None) -> tuple[int, int] | None:
     """
     Find article number range for articles between min_days and max_days old.
     
@@ -89,12 +167,16 @@ def find_article_range_by_dates(group: str, min_days: int, max_days: int) -> tup
         group: newsgroup name
         min_days: minimum age in days (lower bound)
         max_days: maximum age in days (upper bound)
+        client: open NNTP connection to use (left open); by default one is
+                opened and closed here
+        pool: NNTPClientPool to borrow a second connection from, if one is
+              free, so both bounds are searched at once
     
     Returns:
         Tuple of (lower_artnum, upper_artnum) or None if range not found
     """
-    config = get_config()
-    nntp_client = get_nntp_client(config)
+    # The config is only needed to open a connection of our own
+    nntp_client = client or get_nntp_client(get_config())
     
     try:
         # Get group info
@@ -109,18 +191,33 @@ def find_article_range_by_dates(group: str, min_days: int, max_days: int) -> tup
         if oldest_date and days_old(oldest_date) < min_days:
             return None
         
-        # Binary search for bounds
-        lower_artnum = binary_search_date_boundary(
-            nntp_client, group, first, last, min_days, find_lower=True
-        )
-        
-        upper_artnum = binary_search_date_boundary(
-            nntp_client, group, first, last, max_days, find_lower=False
-        )
+        # The searches are independent, so if the pool has a connection to
+        # spare the upper one runs on it and the round-trips overlap. Waiting
+        # for one could deadlock groups that each hold a connection already,
+        # so otherwise both run on this connection in turn.
+        with (pool.client(wait=False) if pool is not None else nullcontext()) as spare_client, \
+             ThreadPoolExecutor(max_workers=1) as executor:
+            if spare_client is not None:
+                spare_client.group(group)
+                upper_future = executor.submit(
+                    binary_search_date_boundary, spare_client, group, first, last, max_days, False
+                )
+            lower_artnum, lower_date = binary_search_date_boundary(
+                nntp_client, group, first, last, min_days, find_lower=True
+            )
+            if spare_client is not None:
+                upper_artnum, upper_date = upper_future.result()
+            else:
+                upper_artnum, upper_date = binary_search_date_boundary(
+                    nntp_client, group, first, last, max_days, find_lower=False
+                )
         
-        # Get the actual ages
-        lower_date = get_article_date(nntp_client, group, lower_artnum)
-        upper_date = get_article_date(nntp_client, group, upper_artnum)
+        # Get the actual ages; the searches already know them unless a
+        # bound fell back to the end of the range without being probed
+        if lower_date is None:
+            lower_date = get_article_date(nntp_client, group, lower_artnum)
+        if upper_date is None:
+            upper_date = get_article_date(nntp_client, group, upper_artnum)
         
         lower_age = days_old(lower_date) if lower_date else None
         upper_age = days_old(upper_date) if upper_date else None
@@ -129,7 +226,8 @@ def find_article_range_by_dates(group: str, min_days: int, max_days: int) -> tup
 
         
     finally:
-        nntp_client.quit()
+        if client is None:
+            nntp_client.quit()
 
 if __name__ == "__main__":
     config = get_config()
@@ -145,7 +243,10 @@ if __name__ == "__main__":
     print(f"  Group: {group}")
     print(f"  Date range: {min_days} to {max_days} days old")
     
-    result = find_article_range_by_dates(group, min_days, max_days)
+    # One connection is opened by the search itself and one spare searches
+    # the other bound alongside it
+    with NNTPClientPool(config, 1) as pool:
+        result = find_article_range_by_dates(group, min_days, max_days, pool=pool)
     
     if result:
         lower_artnum, upper_artnum , lower_age, upper_age = result
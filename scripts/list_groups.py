@@ -1,7 +1,7 @@
 """Example: List all newsgroups available on the NNTP server."""
 
 import sqlite3
-from nntp_lib import get_config, get_nntp_client
+from nntp_lib import get_config, get_nntp_client, connect_db, close_db
 
 def ensure_groups_table(conn: sqlite3.Connection):
     """Create newsgroups table if it doesn't exist."""
@@ -59,7 +59,7 @@ def list_all_groups(save_to_db: bool = True):
             DB_BASE_PATH = config.get('db', 'DB_BASE_PATH', fallback='/tmp/nntp-index')
             db_path = f"{DB_BASE_PATH}/newsgroups.sqlite"
             
-            conn = sqlite3.connect(db_path)
+            conn = connect_db(db_path)
             ensure_groups_table(conn)
             
             cur = conn.cursor()
@@ -70,7 +70,7 @@ def list_all_groups(save_to_db: bool = True):
             """, groups_data)
             
             conn.commit()
-            conn.close()
+            close_db(conn)
             
             print(f"\nSaved {len(groups_data):,} groups to: {db_path}")
         
@@ -1,10 +1,8 @@
 
-import sqlite3
-import orjson
 import time
-import os
 from nntp_lib import get_config
-from nntp_lib.db import ensure_db, upsert_headers
+from nntp_lib.db import backup_db, connect_db, ensure_schema, ensure_indexes, upsert_headers
+from nntp_lib.archive import archive_path, read_archive
 
 # Read config and group name
 
@@ -12,35 +10,39 @@ config = get_config()
 DB_BASE_PATH = config.get('db', 'DB_BASE_PATH', fallback='/mnt/r/tmp/nzbindex')
 GROUP = config['groups']['names'].split(',')[0].strip()
 DB_PATH = f"{DB_BASE_PATH}/{GROUP}.sqlite"
-JSON_PATH = f"{DB_BASE_PATH}/headers-archive/{GROUP}_array.json"
+ARCHIVE_COMPRESSION = config.get('archive', 'compression', fallback='none')
+ARCHIVE_PATH = archive_path(f"{DB_BASE_PATH}/headers-archive", GROUP, ARCHIVE_COMPRESSION)
 
-# Load JSON array
+# Create in-memory DB
 
-print(f"Loading JSON array from {JSON_PATH}...")
+print("Creating in-memory SQLite DB...")
+conn_mem = connect_db(':memory:')
+# Indexes are built once after the bulk load
+ensure_schema(conn_mem)
+
+# Stream the archive written by create_db.py into the DB in batches, all in
+# one explicit transaction, so memory is bounded by the batch size
+print(f"Loading header archive from {ARCHIVE_PATH} and upserting rows...")
 start_time = time.time()
-with open(JSON_PATH, 'rb') as f:
-    rows = orjson.loads(f.read())
+total_rows = 0
+conn_mem.execute("BEGIN IMMEDIATE")
+for rows in read_archive(ARCHIVE_PATH, ARCHIVE_COMPRESSION):
+    upsert_headers(conn_mem, GROUP, rows, commit=False)
+    total_rows += len(rows)
+conn_mem.commit()
 end_time = time.time()
-print(f"Loaded {len(rows):,} rows in {end_time - start_time:.4f} seconds.")
-
-# Create in-memory DB and insert
-
-print("Creating in-memory SQLite DB and upserting rows...")
-conn_mem = sqlite3.connect(':memory:')
-ensure_db(conn_mem)
+print(f"Loaded and upserted {total_rows:,} rows in {end_time - start_time:.4f} seconds.")
 
-# Bulk upsert using the same logic as create_db.py
+print("Building indexes...")
 start_time = time.time()
-upsert_headers(conn_mem, GROUP, rows)
+ensure_indexes(conn_mem)
 end_time = time.time()
-print(f"Upserted {len(rows):,} rows in {end_time - start_time:.4f} seconds.")
+print(f"Built indexes in {end_time - start_time:.4f} seconds.")
 
 # Backup to disk DB
 print(f"Backing up in-memory DB to disk DB at {DB_PATH}...")
-conn_disk = sqlite3.connect(DB_PATH)
 start_time = time.time()
-conn_mem.backup(conn_disk)
-conn_disk.close()
+backup_db(conn_mem, DB_PATH)
 end_time = time.time()
 print(f"Backup completed in {end_time - start_time:.4f} seconds.")
 
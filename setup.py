@@ -11,6 +11,10 @@ setup(
     install_requires=[
         'orjson>=3.9.0',
     ],
+    extras_require={
+        'parquet': ['pyarrow>=7.0'],
+        'zstd': ['zstandard>=0.15'],
+    },
     python_requires='>=3.10',
     classifiers=[
         'Development Status :: 4 - Beta',
@@ -0,0 +1,133 @@
+"""Tests for writing header archives and loading them back with nntp_lib.archive."""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+from nntp_lib import archive
+from nntp_lib.archive import (ARCHIVE_READ_ROWS, archive_path, open_archive, read_archive,
+                              write_columns)
+from nntp_lib.db import ArticleColumns, ensure_schema, upsert_headers
+
+COMPRESSIONS = ['none', 'gzip', 'zstd', 'parquet']
+
+def _columns(first: int, count: int) -> ArticleColumns:
+    """`count` articles numbered from `first`, with NULLs and non-ASCII text mixed in."""
+    columns = ArticleColumns()
+    for n in range(first, first + count):
+        columns.message_id.append(f'<m{n}@x>')
+        columns.artnum.append(n)
+        columns.subject.append(f'Show [{n % 7}/6] - "é 日本.rar" yEnc ({n}/{n + 3})')
+        columns.from_addr.append(f'poster{n % 3} <p@x>')
+        columns.date_epoch.append(None if n % 5 == 0 else 1672653600 + n)
+        columns.refs.append(None if n % 2 else f'<r{n}@x>')
+        columns.bytes.append(n * 1000)
+        columns.lines.append(n % 11)
+        columns.xref.append(None if n % 3 == 0 else f'news.x alt.test:{n}')
+    return columns
+
+def _stored(conn: sqlite3.Connection) -> list[tuple]:
+    return conn.execute("""
+        SELECT message_id, artnum, subject, from_addr, date_epoch, refs, bytes, lines, xref
+        FROM articles WHERE group_name = 'alt.test' ORDER BY artnum
+    """).fetchall()
+
+def _expected(columns: ArticleColumns) -> list[tuple]:
+    return list(zip(columns.message_id, columns.artnum, columns.subject, columns.from_addr,
+                    columns.date_epoch, columns.refs, columns.bytes, columns.lines, columns.xref))
+
+def _available(compression: str) -> bool:
+    if compression == 'parquet':
+        return archive.pq is not None
+    if compression == 'zstd':
+        return archive.zstandard is not None
+    return True
+
+class TestArchiveRoundTrip(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.base = tmp.name
+        print_patch = mock.patch('builtins.print')
+        print_patch.start()
+        self.addCleanup(print_patch.stop)
+
+    def write(self, compression: str, chunks: list[ArticleColumns]) -> str:
+        path = archive_path(self.base, 'alt.test', compression)
+        with open_archive(path, compression) as f:
+            for columns in chunks:
+                self.assertEqual(write_columns(f, columns, 'alt.test'), len(columns))
+        return path
+
+    def load(self, path: str, compression: str, **kwargs) -> tuple[list[tuple], list[int]]:
+        """Upsert every batch read from `path`; returns the stored rows and the batch sizes."""
+        conn = sqlite3.connect(':memory:')
+        self.addCleanup(conn.close)
+        ensure_schema(conn)
+        sizes = []
+        for batch in read_archive(path, compression, **kwargs):
+            sizes.append(len(batch))
+            upsert_headers(conn, 'alt.test', batch)
+        return _stored(conn), sizes
+
+    def test_round_trip(self):
+        chunks = [_columns(1, 40), _columns(41, 0), _columns(41, 17)]
+        expected = _expected(_columns(1, 57))
+        for compression in COMPRESSIONS:
+            for batch_rows in (1, 7, 57, 100):
+                with self.subTest(compression=compression, batch_rows=batch_rows):
+                    if not _available(compression):
+                        self.skipTest(f"{compression} support not installed")
+                    path = self.write(compression, chunks)
+                    stored, sizes = self.load(path, compression, batch_rows=batch_rows)
+                    self.assertEqual(stored, expected)
+                    self.assertEqual(sum(sizes), 57)
+                    self.assertLessEqual(max(sizes), batch_rows)
+
+    def test_batches_split_at_read_rows(self):
+        for compression in COMPRESSIONS:
+            for count, sizes in ((ARCHIVE_READ_ROWS - 1, [ARCHIVE_READ_ROWS - 1]),
+                                 (ARCHIVE_READ_ROWS, [ARCHIVE_READ_ROWS]),
+                                 (ARCHIVE_READ_ROWS + 1, [ARCHIVE_READ_ROWS, 1])):
+                with self.subTest(compression=compression, count=count):
+                    if not _available(compression):
+                        self.skipTest(f"{compression} support not installed")
+                    columns = _columns(1, count)
+                    path = self.write(compression, [columns])
+                    self.assertEqual(self.load(path, compression), (_expected(columns), sizes))
+
+    def test_empty_archive(self):
+        for compression in COMPRESSIONS:
+            with self.subTest(compression=compression):
+                if not _available(compression):
+                    self.skipTest(f"{compression} support not installed")
+                path = self.write(compression, [])
+                self.assertTrue(os.path.exists(path))
+                self.assertEqual(self.load(path, compression), ([], []))
+
+    def test_parquet_batches_are_columnar(self):
+        for compression in COMPRESSIONS:
+            with self.subTest(compression=compression):
+                if not _available(compression):
+                    self.skipTest(f"{compression} support not installed")
+                columns = _columns(1, 20)
+                path = self.write(compression, [columns])
+                batch, = read_archive(path, compression)
+                if compression == 'parquet':
+                    self.assertEqual(batch, columns)
+                else:
+                    self.assertEqual(batch, list(columns.to_dicts('alt.test')))
+
+    def test_zstd_needs_zstandard(self):
+        path = archive_path(self.base, 'alt.test', 'zstd')
+        with mock.patch.object(archive, 'zstandard', None):
+            with self.assertRaises(RuntimeError):
+                open_archive(path, 'zstd')
+            with self.assertRaises(RuntimeError):
+                next(read_archive(path, 'zstd'))
+        self.assertFalse(os.path.exists(path))
+
+if __name__ == '__main__':
+    unittest.main()
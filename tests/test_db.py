@@ -0,0 +1,81 @@
+"""Tests for the articles schema and upserts in nntp_lib.db."""
+
+import sqlite3
+import unittest
+from unittest import mock
+
+from nntp_lib.db import ArticleColumns, ensure_schema, upsert_headers
+
+# articles as created before date_epoch existed, with dates stored as
+# local-time ISO strings
+LEGACY_SCHEMA = """
+    CREATE TABLE articles (
+        message_id   TEXT PRIMARY KEY,
+        group_name   TEXT NOT NULL,
+        artnum       INTEGER NOT NULL,
+        subject      TEXT,
+        from_addr    TEXT,
+        date_utc     TEXT,
+        refs         TEXT,
+        bytes        INTEGER,
+        lines        INTEGER,
+        xref         TEXT
+    )
+"""
+
+# 2023-01-02 10:00:00 UTC
+EPOCH = 1672653600
+
+def _dates(conn: sqlite3.Connection) -> dict:
+    return {message_id: (date_utc, date_epoch) for message_id, date_utc, date_epoch
+            in conn.execute("SELECT message_id, date_utc, date_epoch FROM articles")}
+
+class TestDateEpoch(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(':memory:')
+        print_patch = mock.patch('builtins.print')
+        print_patch.start()
+        self.addCleanup(print_patch.stop)
+        self.addCleanup(self.conn.close)
+
+    def test_migration_backfills_legacy_rows(self):
+        self.conn.execute(LEGACY_SCHEMA)
+        self.conn.executemany(
+            "INSERT INTO articles (message_id, group_name, artnum, date_utc) VALUES (?, 'g', ?, ?)",
+            [('<utc>', 1, '2023-01-02T10:00:00+00:00'),
+             ('<east>', 2, '2023-01-02T12:00:00+02:00'),
+             ('<west>', 3, '2023-01-02T04:30:00-05:30'),
+             ('<none>', 4, None)])
+        self.conn.commit()
+
+        ensure_schema(self.conn)
+        ensure_schema(self.conn)
+
+        dates = _dates(self.conn)
+        self.assertEqual({mid: epoch for mid, (_, epoch) in dates.items()},
+                         {'<utc>': EPOCH, '<east>': EPOCH, '<west>': EPOCH, '<none>': None})
+        self.assertEqual(dates['<east>'][0], '2023-01-02T12:00:00+02:00')
+
+    def test_legacy_dict_row_falls_back_to_date_utc(self):
+        ensure_schema(self.conn)
+        upsert_headers(self.conn, 'g', [
+            {'message_id': '<legacy>', 'artnum': 1, 'date_utc': '2023-01-02T12:00:00+02:00'},
+            {'message_id': '<both>', 'artnum': 2, 'date_utc': '2000-01-01T00:00:00+00:00',
+             'date_epoch': EPOCH},
+            {'message_id': '<neither>', 'artnum': 3},
+        ])
+        self.assertEqual(_dates(self.conn), {
+            '<legacy>': ('2023-01-02T12:00:00+02:00', EPOCH),
+            '<both>': ('2000-01-01T00:00:00+00:00', EPOCH),
+            '<neither>': (None, None),
+        })
+
+    def test_new_rows_store_epoch_only(self):
+        ensure_schema(self.conn)
+        upsert_headers(self.conn, 'g', ArticleColumns(
+            message_id=['<new>'], artnum=[1], subject=['s'], from_addr=['f'], date_epoch=[EPOCH],
+            refs=[''], bytes=[1], lines=[1], xref=[None]))
+        self.assertEqual(_dates(self.conn), {'<new>': (None, EPOCH)})
+
+if __name__ == '__main__':
+    unittest.main()
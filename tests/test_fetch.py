@@ -0,0 +1,233 @@
+"""Tests for the XOVER readers, date parsing and connection pool in nntp_lib.fetch."""
+
+import io
+import nntplib
+import random
+import threading
+import time
+import unittest
+import zlib
+from configparser import ConfigParser
+from email.utils import mktime_tz, parsedate_tz
+from unittest import mock
+
+from nntp_lib import fetch
+from nntp_lib.fetch import NNTPClient, NNTPClientPool, parse_overview_date
+
+NEXT_REPLY = b'211 4 1 4 alt.test\r\n'
+
+def overview_line(n: int) -> bytes:
+    return (f'{n}\tTest [1/3] - "a.jpg" yEnc ({n}/9)\tposter <p@x>\t'
+            f'Mon, 02 Jan 2023 10:00:00 +0000\t<m{n}@x>\t\t1234\t10\tXref: news.x alt.test:{n}').encode()
+
+def plain_block(lines: list[bytes], status: bytes = b'224 overview follows') -> bytes:
+    return status + b'\r\n' + b''.join(line + b'\r\n' for line in lines) + b'.\r\n'
+
+def compressed_block(lines: list[bytes], terminator_inside: bool,
+                     status: bytes = b'224 overview follows [COMPRESS=GZIP]') -> bytes:
+    body = b''.join(line + b'\r\n' for line in lines)
+    if terminator_inside:
+        return status + b'\r\n' + zlib.compress(body + b'.\r\n')
+    return status + b'\r\n' + zlib.compress(body) + b'.\r\n'
+
+class _Socket(io.RawIOBase):
+    """Server side of a connection that hands out at most `step` bytes per read."""
+
+    def __init__(self, data: bytes, step: int):
+        self.data = data
+        self.pos = 0
+        self.step = step
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        n = min(len(b), self.step, len(self.data) - self.pos)
+        b[:n] = self.data[self.pos:self.pos + n]
+        self.pos += n
+        return n
+
+def make_client(server_bytes: bytes, step: int = 7, buffer_size: int = 16,
+                compressed: bool = False) -> NNTPClient:
+    """NNTPClient reading `server_bytes` without a real socket."""
+    client = object.__new__(NNTPClient)
+    # Buffered like the socket file NNTPClient opens with makefile("rwb")
+    client.file = io.BufferedRWPair(_Socket(server_bytes, step), io.BytesIO(), buffer_size)
+    client.read_size = buffer_size
+    client.debugging = 0
+    client.compressed = compressed
+    return client
+
+class TestBlockReader(unittest.TestCase):
+    def test_pipelined_blocks(self):
+        for step in (1, 2, 3, 4, 5, 7, 13, 4096):
+            for count in (0, 1, 2, 50):
+                lines = [overview_line(n) for n in range(1, count + 1)]
+                with self.subTest(step=step, count=count):
+                    client = make_client(plain_block(lines) + NEXT_REPLY, step)
+                    self.assertEqual(client._getxoverresp(), ('224 overview follows', lines))
+                    self.assertEqual(client.file.read(), NEXT_REPLY)
+
+    def test_terminator_after_short_first_read(self):
+        client = make_client(b'224 ok\r\n.\r\n224 x\r\n', step=9, buffer_size=9)
+        self.assertEqual(client._getxoverresp(), ('224 ok', []))
+        self.assertEqual(client.file.read(), b'224 x\r\n')
+
+    def test_empty_range(self):
+        client = make_client(b'423 no articles in that range\r\n' + NEXT_REPLY)
+        self.assertEqual(client._getxoverresp()[1], [])
+        self.assertEqual(client.file.read(), NEXT_REPLY)
+
+class TestCompressedReader(unittest.TestCase):
+    def test_both_terminator_framings(self):
+        for terminator_inside in (True, False):
+            for step in (1, 7, 4096):
+                for count in (0, 1, 50):
+                    lines = [overview_line(n) for n in range(1, count + 1)]
+                    data = compressed_block(lines, terminator_inside) + NEXT_REPLY
+                    with self.subTest(terminator_inside=terminator_inside, step=step, count=count):
+                        client = make_client(data, step, compressed=True)
+                        self.assertEqual(client._getxoverresp()[1], lines)
+                        self.assertEqual(client.file.read(), NEXT_REPLY)
+
+    def test_pipelined_compressed_blocks(self):
+        first = [overview_line(n) for n in range(1, 4)]
+        second = [overview_line(n) for n in range(4, 6)]
+        data = compressed_block(first, True) + compressed_block(second, False) + NEXT_REPLY
+        client = make_client(data, step=5, compressed=True)
+        self.assertEqual([lines for _, lines in client.xover_raw_many([(1, 3), (4, 5)])],
+                         [first, second])
+        self.assertEqual(client.file.read(), NEXT_REPLY)
+
+    def test_xhdr_inflates(self):
+        lines = [b'1 Mon, 02 Jan 2023 10:00:00 +0000', b'2 Tue, 03 Jan 2023 10:00:00 +0000']
+        for terminator_inside in (True, False):
+            with self.subTest(terminator_inside=terminator_inside):
+                data = compressed_block(lines, terminator_inside, b'221 Header follows [COMPRESS=GZIP]')
+                client = make_client(data + NEXT_REPLY, compressed=True)
+                _, headers = client.xhdr('Date', '1-2')
+                self.assertEqual(headers, [('1', 'Mon, 02 Jan 2023 10:00:00 +0000'),
+                                           ('2', 'Tue, 03 Jan 2023 10:00:00 +0000')])
+                self.assertEqual(client.file.read(), NEXT_REPLY)
+
+class TestXoverRawMany(unittest.TestCase):
+    def test_error_reply_keeps_other_ranges(self):
+        first = [overview_line(1)]
+        third = [overview_line(3)]
+        data = plain_block(first) + b'503 timeout\r\n' + plain_block(third) + NEXT_REPLY
+        results = make_client(data).xover_raw_many([(1, 1), (2, 2), (3, 3)])
+        self.assertEqual(results[0][1], first)
+        self.assertIsInstance(results[1], nntplib.NNTPPermanentError)
+        self.assertEqual(results[2][1], third)
+
+class TestParseOverviewDate(unittest.TestCase):
+    def test_matches_email_utils(self):
+        rng = random.Random(11)
+        days = ['Mon, ', 'Tue, ', '']
+        months = 'Jan Feb Mar Apr May Jun Jul Aug Sep Oct Nov Dec'.split()
+        samples = ['Tue, 29 Feb 2000 23:59:59 GMT', '2 Jan 2023 10:00 -0530',
+                   '5 May 2021 01:02:03 UTC (comment)', 'Wed, 1 Jun 2022 10:00:00 +1400',
+                   'wed, 1 jUN 2022 10:00:00 z', 'Fri, 13 Oct 2006 16:57:49 PST', '1 Jan 99 00:00:00 +0000']
+        for _ in range(20000):
+            samples.append(f'{rng.choice(days)}{rng.randint(1, 28):02d} {rng.choice(months)} '
+                           f'{rng.randint(1980, 2030)} {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:'
+                           f'{rng.randint(0, 59):02d} {rng.choice("+-")}{rng.randint(0, 14):02d}'
+                           f'{rng.choice([0, 30, 45]):02d}')
+        for value in samples:
+            self.assertEqual(parse_overview_date(value.encode()), mktime_tz(parsedate_tz(value)), value)
+
+    def test_unparseable(self):
+        self.assertIsNone(parse_overview_date(b'garbage'))
+        self.assertIsNone(parse_overview_date(b''))
+
+class _StubClient:
+    """Pooled connection serving overview lines.
+
+    Asking for a range in `drop` loses the connection; ranges in `fail` get
+    an error reply.
+    """
+
+    xref_index = 0
+
+    def __init__(self, drop=(), fail=()):
+        self.drop = drop
+        self.fail = fail
+        self.requested = []
+
+    def quit(self):
+        pass
+
+    def group(self, name):
+        return '211', 100, 1, 100, name
+
+    def xover_raw_many(self, ranges):
+        self.requested.append(ranges)
+        if any(r in self.drop for r in ranges):
+            raise OSError('connection dropped')
+        return [nntplib.NNTPTemporaryError('503 timeout') if (start, end) in self.fail
+                else ('224', [overview_line(n) for n in range(start, end + 1)])
+                for start, end in ranges]
+
+def _fetch_with(connect) -> list[int]:
+    """Fetch articles 1-40 in 10-article chunks on one worker, connecting with `connect`."""
+    config = ConfigParser()
+    config.read_dict({'servers': {'max_workers': '1', 'pipeline_depth': '4'}})
+    with mock.patch.object(fetch, 'get_nntp_client', connect), \
+         mock.patch('builtins.print'):
+        return fetch.fetch_headers_chunked(config, 'alt.test', 40, 1, chunk_size=10).artnum
+
+class TestClientPool(unittest.TestCase):
+    def test_waiters_wake_when_every_borrower_fails(self):
+        with mock.patch.object(fetch, 'get_nntp_client', lambda config: _StubClient()):
+            pool = NNTPClientPool(None, 2)
+            errors = []
+
+            def borrow_and_fail():
+                try:
+                    with pool.client():
+                        # Held long enough for the other threads to queue up
+                        time.sleep(0.05)
+                        raise OSError('connection dropped')
+                except OSError as e:
+                    errors.append(e)
+
+            threads = [threading.Thread(target=borrow_and_fail, daemon=True) for _ in range(6)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(5)
+            self.assertFalse(any(thread.is_alive() for thread in threads))
+            self.assertEqual(len(errors), 6)
+            self.assertEqual(pool._open, 0)
+
+    def test_no_wait_when_exhausted(self):
+        with mock.patch.object(fetch, 'get_nntp_client', lambda config: _StubClient()):
+            with NNTPClientPool(None, 1) as pool:
+                with pool.client() as client:
+                    with pool.client(wait=False) as spare:
+                        self.assertIsNotNone(client)
+                        self.assertIsNone(spare)
+
+    def test_dropped_batch_retried_on_fresh_connection(self):
+        opened = []
+
+        def connect(config):
+            # Only the first connection is dropped
+            opened.append(_StubClient(drop={(21, 30)} if not opened else ()))
+            return opened[-1]
+
+        self.assertEqual(_fetch_with(connect), list(range(1, 41)))
+        self.assertEqual(len(opened), 2)
+
+    def test_only_failed_range_retried(self):
+        opened = []
+
+        def connect(config):
+            opened.append(_StubClient(fail={(21, 30)} if not opened else ()))
+            return opened[-1]
+
+        self.assertEqual(_fetch_with(connect), list(range(1, 41)))
+        self.assertEqual(opened[1].requested, [[(21, 30)]])
+
+if __name__ == '__main__':
+    unittest.main()
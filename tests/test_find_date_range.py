@@ -0,0 +1,176 @@
+"""Tests for the article date search in scripts/find_date_range.py."""
+
+import os
+import random
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import find_date_range
+from find_date_range import (ARTICLE_DATE_CACHE_SIZE, XHDR_WINDOW, binary_search_date_boundary,
+                             find_article_range_by_dates, get_article_date)
+
+class _DateServer:
+    """Connection serving Date headers for the articles in `dates` (artnum -> header)."""
+
+    def __init__(self, dates: dict[int, str]):
+        self.dates = dates
+        self.xhdr_calls = 0
+
+    def group(self, name):
+        return '211', len(self.dates), min(self.dates), max(self.dates), name
+
+    def over(self, message_spec):
+        start, end = message_spec
+        return '224', [(n, {'date': self.dates[n]}) for n in range(start, end + 1) if n in self.dates]
+
+    def xhdr(self, header, message_spec):
+        self.xhdr_calls += 1
+        start, end = map(int, message_spec.split('-'))
+        return '221', [(str(n), self.dates[n]) for n in range(start, end + 1) if n in self.dates]
+
+def _dates(first: int, count: int, rng: random.Random, offsets: bool = False) -> dict[int, str]:
+    """Dates rising with article number, with runs of equal dates.
+
+    Ages are odd multiples of 1/16 day, so none lies within an hour of a
+    whole-day target. With offsets, each date is written in a random zone.
+    """
+    now = datetime.now(timezone.utc)
+    age = rng.randint(count // 8, count // 4) * 2 + 1
+    dates = {}
+    for n in range(first, first + count):
+        dt = now - timedelta(days=age / 16)
+        if offsets:
+            dt = dt.astimezone(timezone(timedelta(minutes=rng.choice([-720, -330, -60, 0, 60, 345, 840]))))
+        dates[n] = format_datetime(dt)
+        if rng.random() < 0.7:
+            age = max(1, age - 2 * rng.randint(1, 3))
+    return dates
+
+def _epoch(date: str) -> float | None:
+    try:
+        return parsedate_to_datetime(date).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+class TestXhdrMatchesProbes(unittest.TestCase):
+    def setUp(self):
+        print_patch = mock.patch('builtins.print')
+        print_patch.start()
+        self.addCleanup(print_patch.stop)
+        self.addCleanup(find_date_range._article_dates.clear)
+
+    def search(self, dates, first, last, target_days, find_lower, use_xhdr):
+        # Each search starts from an empty cache so neither sees the other's dates
+        find_date_range._article_dates.clear()
+        server = _DateServer(dates)
+        result = binary_search_date_boundary(server, 'alt.test', first, last, target_days,
+                                             find_lower, use_xhdr=use_xhdr)
+        return result, server.xhdr_calls
+
+    def assertSameBoundary(self, dates, first, last, target_days):
+        for find_lower in (True, False):
+            with self.subTest(first=first, last=last, target_days=target_days, find_lower=find_lower):
+                with_xhdr, xhdr_calls = self.search(dates, first, last, target_days, find_lower, True)
+                probed, probe_xhdr_calls = self.search(dates, first, last, target_days, find_lower, False)
+                self.assertEqual(with_xhdr, probed)
+                self.assertEqual(xhdr_calls, 1)
+                self.assertEqual(probe_xhdr_calls, 0)
+
+    def test_same_boundary(self):
+        rng = random.Random(9)
+        for first, count in ((1, 1), (1, 2), (100, 50), (1000, XHDR_WINDOW), (1, 3 * XHDR_WINDOW + 5)):
+            dates = _dates(first, count, rng)
+            last = first + count - 1
+            oldest = (count // 4) * 2 // 16 + 2
+            # Targets past both ends of the range leave the fallback bounds
+            targets = {0, 1, oldest, oldest + 100} | {rng.randint(1, oldest) for _ in range(8)}
+            for target_days in sorted(targets):
+                self.assertSameBoundary(dates, first, last, target_days)
+
+    def test_dates_in_any_zone(self):
+        rng = random.Random(18)
+        dates = _dates(1, 2 * XHDR_WINDOW, rng, offsets=True)
+        for target_days in range(0, 2 * XHDR_WINDOW // 32 + 3, 7):
+            self.assertSameBoundary(dates, 1, 2 * XHDR_WINDOW, target_days)
+
+    def test_missing_and_unparseable_dates(self):
+        # Within one XHDR window the reply holds every date, so the XHDR
+        # search finds the exact boundary. Probing treats a missing or
+        # unparseable article as being on the far side and may stop short.
+        rng = random.Random(23)
+        for trial in range(20):
+            count = rng.randint(1, XHDR_WINDOW)
+            dates = _dates(1, count, rng, offsets=True)
+            for n in rng.sample(sorted(dates), rng.randint(0, count)):
+                if rng.random() < 0.5:
+                    del dates[n]
+                else:
+                    dates[n] = rng.choice(['garbage', '', 'Mon, 32 Foo 2023 25:00:00 +0000'])
+            epochs = {n: _epoch(date) for n, date in dates.items()}
+            epochs = {n: epoch for n, epoch in epochs.items() if epoch is not None}
+            now = datetime.now(timezone.utc).timestamp()
+            oldest = count // 32 + 2
+            for target_days in sorted({0, 1, oldest} | {rng.randint(1, oldest) for _ in range(4)}):
+                cutoff = now - target_days * 86400
+                older = [n for n, epoch in epochs.items() if epoch <= cutoff]
+                younger = [n for n, epoch in epochs.items() if epoch > cutoff]
+                for find_lower, found in ((True, max(older, default=None)), (False, min(younger, default=None))):
+                    with self.subTest(trial=trial, target_days=target_days, find_lower=find_lower):
+                        fallback = 1 if find_lower else count
+                        (artnum, dt), _ = self.search(dates, 1, count, target_days, find_lower, True)
+                        (probed, probed_dt), _ = self.search(dates, 1, count, target_days, find_lower, False)
+                        self.assertEqual(artnum, fallback if found is None else found)
+                        self.assertEqual(dt and dt.timestamp(), epochs.get(found))
+                        if probed_dt is None:
+                            self.assertEqual(probed, fallback)
+                        elif find_lower:
+                            self.assertLessEqual(probed_dt.timestamp(), cutoff)
+                            self.assertLessEqual(probed, artnum)
+                        else:
+                            self.assertGreater(probed_dt.timestamp(), cutoff)
+                            self.assertGreaterEqual(probed, artnum)
+
+class TestArticleDateCache(unittest.TestCase):
+    def setUp(self):
+        find_date_range._article_dates.clear()
+        self.addCleanup(find_date_range._article_dates.clear)
+
+    def test_oldest_dates_evicted(self):
+        server = _DateServer(_dates(1, ARTICLE_DATE_CACHE_SIZE + 100, random.Random(8)))
+        server.over = mock.Mock(wraps=server.over)
+        for n in range(1, ARTICLE_DATE_CACHE_SIZE + 101):
+            get_article_date(server, 'alt.test', n)
+        self.assertEqual(len(find_date_range._article_dates), ARTICLE_DATE_CACHE_SIZE)
+        self.assertEqual(next(iter(find_date_range._article_dates)), ('alt.test', 101))
+
+        # Cached dates are served without a request; evicted ones are fetched again
+        calls = server.over.call_count
+        get_article_date(server, 'alt.test', ARTICLE_DATE_CACHE_SIZE + 100)
+        self.assertEqual(server.over.call_count, calls)
+        get_article_date(server, 'alt.test', 1)
+        self.assertEqual(server.over.call_count, calls + 1)
+        self.assertNotIn(('alt.test', 101), find_date_range._article_dates)
+
+class TestFindArticleRange(unittest.TestCase):
+    def setUp(self):
+        print_patch = mock.patch('builtins.print')
+        print_patch.start()
+        self.addCleanup(print_patch.stop)
+        self.addCleanup(find_date_range._article_dates.clear)
+
+    def test_given_client_needs_no_config(self):
+        server = _DateServer(_dates(1, 500, random.Random(14)))
+        with mock.patch.object(find_date_range, 'get_config', side_effect=AssertionError('config read')), \
+             mock.patch.object(find_date_range, 'get_nntp_client', side_effect=AssertionError('connected')):
+            lower, upper, lower_age, upper_age = find_article_range_by_dates('alt.test', 2, 5, client=server)
+        self.assertLess(upper, lower)
+        self.assertGreaterEqual(lower_age, 2)
+        self.assertLessEqual(upper_age, 5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,233 @@
+"""Tests for subject parsing, the article filters and NZB building in nntp_lib.nzb."""
+
+import random
+import sqlite3
+import unittest
+import xml.etree.ElementTree as ET
+from unittest import mock
+
+from nntp_lib.db import ensure_fts, ensure_schema, fts_ready
+from nntp_lib.nzb import (Article, _filter_where, _matches_any, _select_sql, build_nzb_xml,
+                          extract_nm_leftmost, extract_nm_rightmost, normalize_subject_base,
+                          parse_subject)
+
+# Fragments that exercise each counter form, near misses, and the word
+# characters around a cut that make parse_subject fall back
+ATOMS = ['(1/5)', '[02/10]', '{3/3}', 'part 2 of 7', 'Part 10 of 12', 'yEnc', 'YENC', 'yEncode',
+         '"file.jpg"', 'File 3 of 9', '-', ' . ', '[001]', '(12)', '308.31 kB', 'x.rar', 'y.r01',
+         'abc_def', '__', 'Show', '720p', 'é', '日本', "it's", '  ', '\t', '123', 'S01E02',
+         'a(1/2)b', '[1/2]]', 'part2of3', 'of', '(3/', '/4)', '.', '_', 'X', 'p', 'y']
+
+def _sequential(subject):
+    return (normalize_subject_base(subject), extract_nm_leftmost(subject),
+            extract_nm_rightmost(subject))
+
+class TestParseSubject(unittest.TestCase):
+    def test_known_subjects(self):
+        for subject in ['Show [1/3] - "a.jpg" yEnc (1/2)',
+                        'part 1 of 2 [3/4] part 3 of 4',
+                        'yEncyEnc', 'xpart 1 of 2y', 'a(1/2)b(3/4)c', 'ya(1/2)Enc',
+                        'pa(1/2)rt 1 of 2', '', '   ', 'no counters here']:
+            with self.subTest(subject=subject):
+                self.assertEqual(parse_subject(subject), _sequential(subject))
+
+    def test_matches_sequential_helpers(self):
+        rng = random.Random(7)
+        for _ in range(20000):
+            for subject in (' '.join(rng.choice(ATOMS) for _ in range(rng.randint(0, 9))),
+                            ''.join(rng.choice(ATOMS) for _ in range(rng.randint(0, 6)))):
+                self.assertEqual(parse_subject(subject), _sequential(subject), subject)
+
+# Subjects and posters for the filter tests: LIKE wildcards and regex
+# metacharacters as literal text, non-ASCII case pairs and NULLs
+FILTER_TEXTS = ['Show.720p (1/5) yEnc', 'Showx720p [2/5]', 'a+b=c', 'aab=c', '50% off', '50 off',
+                'file_01.rar', 'file-01.rar', 'x(y) [1/2]', 'xy', 'CAFÉ', 'café', 'Café', 'ÉTÉ',
+                'back\\slash', 'multi\nline', '', None, 'poster <p@x.com>', 'POSTER <P@X.COM>',
+                'Ünïcode 日本', 'dot.dot', 'dotxdot', '"quoted"', 'half"quote']
+
+def _load(conn: sqlite3.Connection, rows: list[tuple], first: int = 1):
+    """Store (subject, from_addr) rows in group 'g', numbered from `first`."""
+    conn.executemany(
+        "INSERT INTO articles (message_id, group_name, artnum, subject, from_addr) VALUES (?, 'g', ?, ?, ?)",
+        [(f'<{n}>', n, subject, from_addr) for n, (subject, from_addr) in enumerate(rows, first)])
+    conn.commit()
+
+def _filter_db(rows: list[tuple]) -> sqlite3.Connection:
+    """In-memory articles table holding (subject, from_addr) rows in group 'g'."""
+    conn = sqlite3.connect(':memory:')
+    ensure_schema(conn)
+    _load(conn, rows)
+    conn.create_function("matches_any", 2, _matches_any, deterministic=True)
+    return conn
+
+def _artnums(conn: sqlite3.Connection, where: list[str], params: list) -> list[int]:
+    return [n for n, in conn.execute(_select_sql("artnum", where, "artnum"), params)]
+
+def _not_like_where(not_subject: str | None, not_from: str | None) -> tuple[list[str], list]:
+    """Exclusions as one NOT LIKE per term, as before matches_any() replaced them."""
+    where = ["group_name = ?"]
+    params = ['g']
+    for column, terms in (("subject", not_subject), ("from_addr", not_from)):
+        for term in (terms or '').split('|'):
+            term = term.strip()
+            if term:
+                where.append(f"{column} NOT LIKE ? COLLATE NOCASE")
+                params.append(f"%{term}%")
+    return where, params
+
+class TestExcludeTerms(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(12)
+        rows = [(subject, from_addr) for subject in FILTER_TEXTS for from_addr in (None, 'p@x', 'Ünï')]
+        rows += [(rng.choice(FILTER_TEXTS), rng.choice(FILTER_TEXTS)) for _ in range(200)]
+        self.conn = _filter_db(rows)
+        self.addCleanup(self.conn.close)
+
+    def assertSameRows(self, not_subject, not_from):
+        where, params = _filter_where('g', [], [], not_subject, not_from, False)
+        self.assertEqual(_artnums(self.conn, where, params),
+                         _artnums(self.conn, *_not_like_where(not_subject, not_from)),
+                         (not_subject, not_from))
+
+    def test_matches_not_like(self):
+        for terms in [None, '', ' | ', 'show', 'SHOW|rar', '720p', '.', 'dot.dot', 'x(y', '(1/5)',
+                      'a+b', '+', '50%', '%', '50%off', 'file_01', '_', 'a_b', '%.rar', 'x_y%',
+                      'é', 'É', 'CAFÉ', 'cafÉ', 'ünï', '日本', '\\', 'back\\s', '*', '?', '[1/2]',
+                      '^', '$', 'c$', '^a', '{1}', 'a{1}', '"', 'half"q', 'multi_line', 'multi%line',
+                      '  show  |  ', 'x|y|z', '.*', 'p@x.com']:
+            with self.subTest(terms=terms):
+                self.assertSameRows(terms, None)
+                self.assertSameRows(None, terms)
+                self.assertSameRows(terms, terms)
+
+    def test_random_terms(self):
+        rng = random.Random(21)
+        chars = 'aAbBcCéÉ.%_()+*?[]^$\\|"x 0'
+        for _ in range(500):
+            terms = ''.join(rng.choice(chars) for _ in range(rng.randint(0, 8)))
+            self.assertSameRows(terms, rng.choice([None, terms[::-1]]))
+
+@unittest.skipUnless(sqlite3.sqlite_version_info >= (3, 34, 0), "no FTS5 trigram tokenizer")
+class TestContainsTermsFts(unittest.TestCase):
+    TERMS = ['show', 'SHOW', 'Show.720p', '720', '72', 'x', '', 'rar', '.rar', '%', '50%',
+             '50% off', 'file_01', '_01', 'fi%ar', '"', '"quoted"', 'half"quote', 'f"q', '""',
+             'café', 'CAFÉ', 'ÉTÉ', 'été', 'Ünï', '日本', 'code 日本', 'p@x.com', '<P@X', 'a+b',
+             'x(y)', '[1/2]', 'multi\nline', 'back\\slash', 'NEAR', 'AND', 'ff*', 'a:b', '-01',
+             'second load', 'SECOND', 'nowhere']
+
+    def setUp(self):
+        rng = random.Random(8)
+        texts = FILTER_TEXTS + ['second load only', 'Second <load@x>']
+        self.first = [(rng.choice(FILTER_TEXTS), rng.choice(FILTER_TEXTS)) for _ in range(150)]
+        self.second = [(rng.choice(texts), rng.choice(texts)) for _ in range(150)]
+        self.second += [('second load only', None), (None, 'Second <load@x>')]
+        self.conn = _filter_db(self.first)
+        self.addCleanup(self.conn.close)
+
+    def query(self, subject_terms, from_terms, use_fts):
+        where, params = _filter_where('g', subject_terms, from_terms, None, None, use_fts)
+        return _artnums(self.conn, where, params)
+
+    def assertFtsMatchesLike(self):
+        for term in self.TERMS:
+            for subject_terms, from_terms in (([term], []), ([], [term]), ([term, 'o'], [term])):
+                with self.subTest(subject_terms=subject_terms, from_terms=from_terms):
+                    self.assertEqual(self.query(subject_terms, from_terms, True),
+                                     self.query(subject_terms, from_terms, False))
+
+    def test_matches_like_after_each_load(self):
+        self.assertTrue(ensure_fts(self.conn))
+        self.assertTrue(fts_ready(self.conn))
+        self.assertFtsMatchesLike()
+
+        _load(self.conn, self.second, len(self.first) + 1)
+        self.assertFalse(fts_ready(self.conn))
+        # Until synced, the index does not know about the second load
+        self.assertEqual(self.query(['second load'], [], True), [])
+
+        self.assertTrue(ensure_fts(self.conn))
+        self.assertTrue(fts_ready(self.conn))
+        self.assertTrue(self.query(['second load'], [], True))
+        self.assertTrue(self.query([], ['SECOND'], True))
+        self.assertFtsMatchesLike()
+
+    def test_sync_only_indexes_new_rows(self):
+        ensure_fts(self.conn)
+        _load(self.conn, self.second, len(self.first) + 1)
+        changes = self.conn.total_changes
+        ensure_fts(self.conn)
+        self.assertGreater(self.conn.total_changes, changes)
+        # Nothing past the highest indexed rowid, so nothing to write
+        changes = self.conn.total_changes
+        ensure_fts(self.conn)
+        self.assertEqual(self.conn.total_changes, changes)
+
+    def test_only_trigram_terms_use_the_index(self):
+        for term, indexed in (('abc', True), ('a"c', True), ('ab', False), ('a%c', False), ('a_c', False)):
+            with self.subTest(term=term):
+                where, _ = _filter_where('g', [term], [], None, None, True)
+                self.assertEqual('articles_fts' in where[1], indexed)
+
+NZB_NS = '{http://www.newzbin.com/DTD/2003/nzb}'
+
+def _set_complete(parts: list[tuple], m: int) -> bool:
+    """Whether require_complete_sets keeps a set, as decided with the 1..m set difference."""
+    if len(parts) < m:
+        return False
+    part_numbers = {n for n, _ in parts}
+    return not (part_numbers and set(range(1, m + 1)) - part_numbers)
+
+def _nzb_files(xml: str) -> dict[str, list[int]]:
+    """Segment numbers per file subject in an NZB document."""
+    root = ET.fromstring(xml.split('\n', 2)[2])
+    return {file_el.get('subject'): [int(seg.get('number')) for seg in file_el.iter(f'{NZB_NS}segment')]
+            for file_el in root.iter(f'{NZB_NS}file')}
+
+def _parts(numbers: list[int]) -> list[tuple]:
+    return [(n, Article(f'<{i}@x>', f's ({n}/9)', 'p', None, 100, i, 'g'))
+            for i, n in enumerate(numbers)]
+
+class TestCompleteSets(unittest.TestCase):
+    def setUp(self):
+        print_patch = mock.patch('builtins.print')
+        self.print = print_patch.start()
+        self.addCleanup(print_patch.stop)
+
+    def test_known_sets(self):
+        for numbers, m, complete in (([1, 2, 3], 3, True), ([3, 1, 2], 3, True),
+                                     ([1, 2], 3, False), ([1, 1, 2], 3, False),
+                                     ([1, 2, 4], 3, False), ([1, 2, 3, 4], 3, True),
+                                     ([0, 1, 2], 3, False), ([1, 3, 3, 3], 3, False),
+                                     ([], 0, True), ([5], 0, True), ([2, 2], 1, False),
+                                     ([1, 2, 2, 3], 3, True)):
+            with self.subTest(numbers=numbers, m=m):
+                self.assertEqual(_set_complete(_parts(numbers), m), complete)
+                groups = {('set', m, 'p'): _parts(numbers)}
+                files = _nzb_files(build_nzb_xml(groups, [], 'g', require_complete_sets=True))
+                self.assertEqual('set' in files, complete)
+                # Without require_complete_sets every set is written, in part order
+                files = _nzb_files(build_nzb_xml(groups, [], 'g'))
+                self.assertEqual(files, {'set': sorted(numbers)})
+
+    def test_missing_parts_reported(self):
+        groups = {('set', 6, 'p'): _parts([1, 2, 2, 4, 6, 9, 9])}
+        build_nzb_xml(groups, [], 'g', require_complete_sets=True)
+        self.print.assert_called_once_with("Skipping incomplete set 'set...': missing parts [3, 5]")
+
+    def test_matches_set_difference(self):
+        rng = random.Random(18)
+        groups = {}
+        for i in range(3000):
+            m = rng.randint(0, 8)
+            numbers = [rng.randint(0, m + 2) for _ in range(rng.randint(0, m + 3))]
+            if rng.random() < 0.4:
+                # Complete sets, with extra copies and stray numbers
+                numbers += list(range(1, m + 1))
+            groups[(f'set{i}', m, 'p')] = _parts(rng.sample(numbers, len(numbers)))
+        files = _nzb_files(build_nzb_xml(groups, [], 'g', require_complete_sets=True))
+        self.assertEqual(set(files), {base for (base, m, _), parts in groups.items()
+                                      if _set_complete(parts, m)})
+        self.assertTrue(files)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+"""Tests for subject normalization in nntp_lib.utils."""
+
+import random
+import re
+import unittest
+
+from nntp_lib.utils import normalize_subject_for_grouping
+
+ATOMS = ['(1/5)', '[02/10]', 'part 2 of 7', 'yEnc', 'YENC', 'yEncode', '"file.jpg"', 'File 3 of 9',
+         'file 10 of 12', '- File 1 of 2 -', 'File1of2', '-', ' . ', '[001]', '(12)', '308.31 kB',
+         '1 GB', 'bytes', 'x.rar', 'y.r01', 'z.par2', 'a.nfo ', 'movie.mkv', '&', '\\', '/', ',',
+         ':', ';', '!', '?', '{', '}', '[', ']', 'abc_def_ghi', '__', 'Show', '720p', 'ubuntu', 'é',
+         "it's", '  ', '\t', '123', 'S01E02', 'of', 'File', '.', '_', 'X']
+SEARCH_TERMS = [None, 'show%720P', 'ubuntu', 'file']
+
+def _sequential_normalize(subject: str, search_term: str = None) -> str:
+    """normalize_subject_for_grouping as it was before its passes were compiled and merged."""
+    s = subject
+    s = re.sub(r'\s*[\[\(]\d+/\d+[\]\)]\s*', ' ', s)
+    s = re.sub(r'\s*\[\d+\]\s*', ' ', s)
+    s = re.sub(r'\s*\(\d+\)\s*', ' ', s)
+    s = re.sub(r'"[^"]*"', '', s)
+    s = re.sub(r'\.(jpg|jpeg|png|gif|bmp|tif|tiff|rar|zip|r\d+|par2?|nfo|sfv|txt|diz|mkv|avi|mp4|wmv|mov|mpg|mpeg|flv|webm|m4v)(\s|$)', ' ', s, flags=re.IGNORECASE)
+    s = re.sub(r'\d+\.?\d*\s*(kb|mb|gb|bytes?)\b', '', s, flags=re.IGNORECASE)
+    s = re.split(r'\s+[-\.]\s+', s, maxsplit=1)[0].strip()
+    if search_term:
+        for term in search_term.split('%'):
+            term = term.strip()
+            if term:
+                s = re.sub(re.escape(term), '', s, flags=re.IGNORECASE)
+    s = re.sub(r'["\']', '', s)
+    s = re.sub(r'\s*yEnc\s*', ' ', s, flags=re.IGNORECASE)
+    s = re.sub(r'\s*-?\s*File\s+\d+\s+of\s+\d+\s*-?\s*', ' ', s, flags=re.IGNORECASE)
+    s = re.sub(r'[&\-\\/,.:;!?(){}[\]]', ' ', s)
+    if len(s) > 10:
+        s = s[:-10] + s[-10:].replace('_', ' ')
+    else:
+        s = s.replace('_', ' ')
+    s = re.sub(r'[\s\d_]+$', '', s)
+    s = re.sub(r'\s+', ' ', s).strip()
+    return s[:100].strip()
+
+class TestNormalizeSubjectForGrouping(unittest.TestCase):
+    def test_known_subjects(self):
+        for subject in ['Show [01/10] - "show.part01.rar" yEnc (1/50)',
+                        'Collection - File 3 of 9 - "a.jpg" yEnc',
+                        'a-File 1 of 2-b', 'x - - File 1 of 2 -- y', 'File 1 of 2File 2 of 2',
+                        '', '   ', 'no markers']:
+            for search_term in SEARCH_TERMS:
+                with self.subTest(subject=subject, search_term=search_term):
+                    self.assertEqual(normalize_subject_for_grouping(subject, search_term),
+                                     _sequential_normalize(subject, search_term))
+
+    def test_matches_sequential_passes(self):
+        rng = random.Random(19)
+        for _ in range(10000):
+            for subject in (' '.join(rng.choice(ATOMS) for _ in range(rng.randint(0, 9))),
+                            ''.join(rng.choice(ATOMS) for _ in range(rng.randint(0, 6)))):
+                search_term = rng.choice(SEARCH_TERMS)
+                self.assertEqual(normalize_subject_for_grouping(subject, search_term),
+                                 _sequential_normalize(subject, search_term), (subject, search_term))
+
+if __name__ == '__main__':
+    unittest.main()